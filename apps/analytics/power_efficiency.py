@@ -5,130 +5,232 @@ Power Efficiency Analysis
 Analyzes latency-per-watt metrics from aligned telemetry data to identify
 optimal power/performance trade-offs and generate efficiency reports.
 """
-import os, json, argparse, pathlib, statistics
+import os, json, argparse, pathlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import Tuple, Iterator, Optional
+import numpy as np
 
-def parse_aligned_data(latency_file: pathlib.Path) -> List[Dict[str, Any]]:
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except Exception:
+    HAVE_NUMBA = False
+
+_loads = orjson.loads if HAVE_ORJSON else json.loads
+
+def iter_lines(path: pathlib.Path, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Yield JSONL records from large sequential reads, carrying partial lines over"""
+    with open(path, "rb") as f:
+        tail = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buf = tail + chunk if tail else chunk
+            start = 0
+            while True:
+                end = buf.find(b"\n", start)
+                if end < 0:
+                    break
+                yield buf[start:end]
+                start = end + 1
+            tail = buf[start:]
+        if tail:
+            yield tail
+
+@dataclass
+class Aligned:
+    """Aligned latency samples stored as parallel columns (struct of arrays)"""
+    ts: np.ndarray    # seconds, float64
+    lat: np.ndarray   # latency in ms, float64
+    pwr: np.ndarray   # power in W, float64
+    pair: np.ndarray  # (stage_a, stage_b) per sample, object
+
+    def __len__(self) -> int:
+        return self.lat.size
+
+def parse_aligned_data(latency_file: pathlib.Path) -> Aligned:
     """Parse aligned latency data with power measurements"""
-    data = []
-    if not latency_file.exists():
-        return data
-
-    for line in open(latency_file, "r"):
-        try:
-            rec = json.loads(line)
-            kv = rec.get("kv", {})
-            if kv.get("lat_ms") is not None and kv.get("power_w") is not None:
-                data.append({
-                    "timestamp": rec["ts_aligned_ns"] / 1e9,
-                    "latency_ms": kv["lat_ms"],
-                    "power_w": kv["power_w"],
-                    "pair": kv.get("pair", ["unknown", "unknown"])
-                })
-        except Exception:
-            continue
-
-    return data
-
-def calculate_efficiency(latency_ms: float, power_w: float) -> float:
-    """Calculate efficiency score (lower is better: ms/W)"""
-    if power_w == 0:
-        return float('inf')
-    return latency_ms / power_w
-
-def calculate_performance_score(latency_ms: float, power_w: float, target_latency: float = 16.67) -> float:
+    ts, lat, pwr, pair = [], [], [], []
+    if latency_file.exists():
+        for line in iter_lines(latency_file):
+            try:
+                rec = _loads(line)
+                kv = rec.get("kv", {})
+                if kv.get("lat_ms") is not None and kv.get("power_w") is not None:
+                    # everything that can raise runs before the first append, so a bad
+                    # record never leaves the columns out of step
+                    t = rec["ts_aligned_ns"] / 1e9
+                    p = tuple(kv.get("pair") or ("unknown", "unknown"))
+                    ts.append(t)
+                    lat.append(kv["lat_ms"])
+                    pwr.append(kv["power_w"])
+                    pair.append(p)
+            except Exception:
+                continue
+
+    return Aligned(
+        ts=np.asarray(ts, dtype=np.float64),
+        lat=np.asarray(lat, dtype=np.float64),
+        pwr=np.asarray(pwr, dtype=np.float64),
+        pair=np.fromiter(pair, dtype=object, count=len(pair)),
+    )
+
+def _welford(arr):
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    lo = np.inf
+    hi = -np.inf
+    for x in arr:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        if x < lo:
+            lo = x
+        if x > hi:
+            hi = x
+    var = m2 / (n - 1) if n > 1 else 0.0
+    return n, mean, var, lo, hi
+
+if HAVE_NUMBA:
+    _welford = njit(_welford)
+
+def running_stats(arr: np.ndarray) -> Tuple[int, float, float, float, float]:
+    """
+    Single-pass (n, mean, sample variance, min, max) using Welford's recurrence.
+    Falls back to NumPy reductions when numba is unavailable.
     """
-    Calculate performance score (higher is better)
+    if HAVE_NUMBA:
+        return _welford(arr)
+    n = arr.size
+    var = float(arr.var(ddof=1)) if n > 1 else 0.0
+    return n, float(arr.mean()), var, float(arr.min()), float(arr.max())
+
+def calculate_efficiency(latency_ms, power_w):
+    """Calculate efficiency score (lower is better: ms/W), element-wise"""
+    latency_ms = np.asarray(latency_ms, dtype=np.float64)
+    power_w = np.asarray(power_w, dtype=np.float64)
+    out = np.full(np.broadcast(latency_ms, power_w).shape, np.inf)
+    return np.divide(latency_ms, power_w, out=out, where=power_w != 0)
+
+def calculate_performance_score(latency_ms, power_w, target_latency: float = 16.67):
+    """
+    Calculate performance score (higher is better), element-wise
     Balances latency target achievement with power consumption
     """
-    latency_score = max(0, 1 - (latency_ms / target_latency))
+    latency_ms = np.asarray(latency_ms, dtype=np.float64)
+    power_w = np.asarray(power_w, dtype=np.float64)
+    latency_score = np.maximum(0, 1 - (latency_ms / target_latency))
     power_efficiency = 1 / (power_w + 1)  # Avoid division by zero
     return latency_score * power_efficiency * 100
 
-def identify_optimal_points(data: List[Dict[str, Any]], percentile: float = 5) -> List[Dict[str, Any]]:
-    """Identify optimal power/performance operating points"""
-    # Calculate efficiency for each point
-    for point in data:
-        point["efficiency"] = calculate_efficiency(point["latency_ms"], point["power_w"])
-        point["performance_score"] = calculate_performance_score(point["latency_ms"], point["power_w"])
+def identify_optimal_points(data: Aligned, percentile: float = 5,
+                            efficiency: Optional[np.ndarray] = None) -> np.ndarray:
+    """Identify optimal power/performance operating points, as indices ordered best-first"""
+    if efficiency is None:
+        efficiency = calculate_efficiency(data.lat, data.pwr)
 
-    # Sort by efficiency (lower is better)
-    sorted_by_efficiency = sorted(data, key=lambda x: x["efficiency"] if x["efficiency"] != float('inf') else float('inf'))
+    # Select the top percentile with an O(N) introselect, then sort only that slice
+    # (lower efficiency is better; ties keep arrival order)
+    optimal_count = max(1, int(efficiency.size * (percentile / 100)))
+    top = np.argpartition(efficiency, optimal_count - 1)[:optimal_count]
+    return top[np.lexsort((top, efficiency[top]))]
 
-    # Take top percentile
-    optimal_count = max(1, int(len(sorted_by_efficiency) * (percentile / 100)))
-    return sorted_by_efficiency[:optimal_count]
+def nearest_rank(n: int, pct: int) -> int:
+    """0-based index of the nearest-rank pct-th percentile of n sorted samples, ceil(pct*n/100) - 1"""
+    return max(0, (pct * n + 99) // 100 - 1)
 
-def generate_report(data: List[Dict[str, Any]], output_path: pathlib.Path):
+def generate_report(data: Aligned, output_path: pathlib.Path):
     """Generate comprehensive efficiency report"""
     if len(data) == 0:
         print("No data available for analysis")
         return
 
-    # Calculate overall statistics
-    latencies = [d["latency_ms"] for d in data]
-    powers = [d["power_w"] for d in data]
-    efficiencies = [calculate_efficiency(d["latency_ms"], d["power_w"]) for d in data if d["power_w"] > 0]
+    ts, lat, pwr = data.ts, data.lat, data.pwr
+    # Efficiency is computed once and shared by the stats and the optimal-point search
+    eff = calculate_efficiency(lat, pwr)
+    eff_valid = eff[pwr > 0]
+    has_eff = eff_valid.size > 0
+    n, lat_mean, lat_var, lat_min, lat_max = running_stats(lat)
+    _, pwr_mean, pwr_var, pwr_min, pwr_max = running_stats(pwr)
+
+    # Nearest-rank p95/p99 from a single O(N) introselect instead of a full sort
+    k95, k99 = nearest_rank(n, 95), nearest_rank(n, 99)
+    part = np.partition(lat, [k95, k99])
 
     report = {
         "timestamp": datetime.utcnow().isoformat() + "Z",
-        "sample_count": len(data),
-        "duration_sec": data[-1]["timestamp"] - data[0]["timestamp"] if len(data) > 1 else 0,
+        "sample_count": n,
+        "duration_sec": float(ts[-1] - ts[0]) if n > 1 else 0,
 
         "latency_stats": {
-            "min_ms": min(latencies),
-            "max_ms": max(latencies),
-            "mean_ms": statistics.mean(latencies),
-            "median_ms": statistics.median(latencies),
-            "stdev_ms": statistics.stdev(latencies) if len(latencies) > 1 else 0,
-            "p95_ms": statistics.quantiles(latencies, n=20)[18] if len(latencies) > 20 else max(latencies),
-            "p99_ms": statistics.quantiles(latencies, n=100)[98] if len(latencies) > 100 else max(latencies),
+            "min_ms": float(lat_min),
+            "max_ms": float(lat_max),
+            "mean_ms": float(lat_mean),
+            "median_ms": float(np.median(lat)),
+            "stdev_ms": float(np.sqrt(lat_var)),
+            "p95_ms": float(part[k95]),
+            "p99_ms": float(part[k99]),
         },
 
         "power_stats": {
-            "min_w": min(powers),
-            "max_w": max(powers),
-            "mean_w": statistics.mean(powers),
-            "median_w": statistics.median(powers),
-            "stdev_w": statistics.stdev(powers) if len(powers) > 1 else 0,
+            "min_w": float(pwr_min),
+            "max_w": float(pwr_max),
+            "mean_w": float(pwr_mean),
+            "median_w": float(np.median(pwr)),
+            "stdev_w": float(np.sqrt(pwr_var)),
         },
 
         "efficiency_stats": {
-            "best_ms_per_w": min(efficiencies) if efficiencies else 0,
-            "worst_ms_per_w": max(efficiencies) if efficiencies else 0,
-            "mean_ms_per_w": statistics.mean(efficiencies) if efficiencies else 0,
-            "median_ms_per_w": statistics.median(efficiencies) if efficiencies else 0,
+            "best_ms_per_w": float(eff_valid.min()) if has_eff else 0,
+            "worst_ms_per_w": float(eff_valid.max()) if has_eff else 0,
+            "mean_ms_per_w": float(eff_valid.mean()) if has_eff else 0,
+            "median_ms_per_w": float(np.median(eff_valid)) if has_eff else 0,
         },
 
         "optimal_points": [],
     }
 
     # Identify top 5% most efficient operating points
-    optimal = identify_optimal_points(data, percentile=5)
+    top = identify_optimal_points(data, percentile=5, efficiency=eff)[:10]  # Top 10 points
+    top_eff = eff[top]
+    top_score = calculate_performance_score(lat[top], pwr[top])
     report["optimal_points"] = [{
-        "timestamp": p["timestamp"],
-        "latency_ms": p["latency_ms"],
-        "power_w": p["power_w"],
-        "efficiency_ms_per_w": p["efficiency"],
-        "performance_score": p["performance_score"],
-    } for p in optimal[:10]]  # Top 10 points
-
-    # Power efficiency buckets
-    power_buckets = {
-        "low": [d for d in data if d["power_w"] < report["power_stats"]["mean_w"] * 0.8],
-        "medium": [d for d in data if report["power_stats"]["mean_w"] * 0.8 <= d["power_w"] <= report["power_stats"]["mean_w"] * 1.2],
-        "high": [d for d in data if d["power_w"] > report["power_stats"]["mean_w"] * 1.2],
-    }
+        "timestamp": t,
+        "latency_ms": l,
+        "power_w": p,
+        "efficiency_ms_per_w": e,
+        "performance_score": sc,
+    } for t, l, p, e, sc in zip(ts[top].tolist(), lat[top].tolist(), pwr[top].tolist(),
+                                top_eff.tolist(), top_score.tolist())]
+
+    # Power efficiency buckets: one digitize pass assigns 0=low, 1=medium, 2=high.
+    # The upper edge is nudged up one ulp so that power == 1.2*mean stays "medium".
+    mean_w = report["power_stats"]["mean_w"]
+    edges = [mean_w * 0.8, np.nextafter(mean_w * 1.2, np.inf)]
+    bucket = np.digitize(pwr, edges)
+    counts = np.bincount(bucket, minlength=3)
+    lat_sums = np.bincount(bucket, weights=lat, minlength=3)
+    pwr_sums = np.bincount(bucket, weights=pwr, minlength=3)
 
     report["power_buckets"] = {}
-    for bucket_name, bucket_data in power_buckets.items():
-        if len(bucket_data) > 0:
-            bucket_latencies = [d["latency_ms"] for d in bucket_data]
+    for k, bucket_name in enumerate(("low", "medium", "high")):
+        count = int(counts[k])
+        if count > 0:
             report["power_buckets"][bucket_name] = {
-                "count": len(bucket_data),
-                "mean_latency_ms": statistics.mean(bucket_latencies),
-                "mean_power_w": statistics.mean([d["power_w"] for d in bucket_data]),
+                "count": count,
+                "mean_latency_ms": float(lat_sums[k] / count),
+                "mean_power_w": float(pwr_sums[k] / count),
             }
 
     # Write JSON report
@@ -151,15 +253,8 @@ def generate_report(data: List[Dict[str, Any]], output_path: pathlib.Path):
 
     print(f"\nReport written to: {output_path}")
 
-def main():
-    ap = argparse.ArgumentParser(description="Power efficiency analysis")
-    ap.add_argument("--data-root", default=os.environ.get("BENCHLAB_DATA_ROOT", "/var/log/benchlab"))
-    ap.add_argument("--session", default=datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%SZ"))
-    ap.add_argument("--output", default=None, help="Output path for JSON report")
-    args = ap.parse_args()
-
-    data_root = pathlib.Path(args.data_root)
-    session_dir = data_root / "sessions" / args.session
+def process_session(session_dir: pathlib.Path, output: Optional[str] = None) -> int:
+    """Parse one session's aligned latency data and write its efficiency report"""
     latency_file = session_dir / "aligned" / "latency.jsonl"
 
     if not latency_file.exists():
@@ -171,14 +266,40 @@ def main():
     data = parse_aligned_data(latency_file)
 
     if len(data) == 0:
-        print("No valid data found")
+        print(f"No valid data found in {latency_file}")
         return 1
 
     # Generate report
-    output_path = pathlib.Path(args.output) if args.output else (session_dir / "analytics" / "power_efficiency.json")
+    output_path = pathlib.Path(output) if output else (session_dir / "analytics" / "power_efficiency.json")
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     generate_report(data, output_path)
+    return 0
+
+def main():
+    ap = argparse.ArgumentParser(description="Power efficiency analysis")
+    ap.add_argument("--data-root", default=os.environ.get("BENCHLAB_DATA_ROOT", "/var/log/benchlab"))
+    ap.add_argument("--session", default=datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%SZ"))
+    ap.add_argument("--output", default=None, help="Output path for JSON report")
+    ap.add_argument("--sessions-glob", default=None,
+                    help="analyze every session matching this glob (e.g. '2025-01-*') in parallel; "
+                         "each report is written to its own session directory")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes for --sessions-glob (default: CPU count)")
+    args = ap.parse_args()
+
+    sessions_root = pathlib.Path(args.data_root) / "sessions"
+
+    if args.sessions_glob:
+        session_dirs = sorted(p for p in sessions_root.glob(args.sessions_glob) if p.is_dir())
+        if not session_dirs:
+            print(f"No sessions match {args.sessions_glob} under {sessions_root}")
+            return 1
+        # Sessions share no state, so each one is a separate CPU-bound job
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            results = list(ex.map(process_session, session_dirs))
+        return max(results)
+
+    return process_session(sessions_root / args.session, args.output)
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
-import os, sys, time, json, pathlib, argparse, statistics, random, gzip
+import os, sys, time, json, math, pathlib, argparse, statistics, random, gzip, signal
 from datetime import datetime
 from typing import Optional, Dict, Any, IO
+import numpy as np
 
 # Add libs to path for SDK import
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent / "libs"))
@@ -13,6 +14,30 @@ except Exception as e:
     print(f"Warning: BenchLab SDK not available: {e}", file=sys.stderr)
     HAVE_SDK = False
 
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+if HAVE_ORJSON:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# Synthetic channel layout: phase offsets per channel, evaluated with one np.sin per group
+V_IDX = np.arange(13)
+P_IDX = np.arange(11)
+F_IDX = np.arange(9)
+TEMP_NAMES = ("chip", "ambient", "ext1", "ext2", "ext3", "ext4")
+TEMP_BASE = np.array([45.0, 25.0, 55.0, 50.0, 48.0, 52.0])
+TEMP_AMP = np.array([5.0, 3.0, 8.0, 6.0, 4.0, 5.0])
+TEMP_PERIOD = np.array([4.0, 8.0, 5.0, 6.0, 7.0, 9.0])
+
+FLUSH_INTERVAL_S = 1.0  # upper bound on samples held in the userspace write buffer
+WRITE_BUFFER_SIZE = 1 << 16
+
 def clock_ns():
     return time.clock_gettime_ns(time.CLOCK_MONOTONIC_RAW)
 
@@ -24,42 +49,30 @@ def session_root(data_root: pathlib.Path, session: str):
 def generate_synthetic_data() -> Dict[str, Any]:
     """Generate comprehensive synthetic sensor data for development/simulation"""
     t = time.time()
-    import math
+
+    voltages = 12.0 + 0.5 * np.sin(t / 5 + V_IDX)
+    rail_v = 12.0 + 0.3 * np.sin(t / 3 + P_IDX)
+    rail_i = 2.0 + 0.5 * np.abs(np.sin(t / 2 + P_IDX))
+    rail_w = rail_v * rail_i
+    duty = (128 + 64 * np.abs(np.sin(t / 7 + F_IDX))).astype(np.int64)
+    rpm = (1500 + 500 * np.abs(np.sin(t / 6 + F_IDX))).astype(np.int64)
+    temps = TEMP_BASE + TEMP_AMP * np.abs(np.sin(t / TEMP_PERIOD))
 
     return {
         # 13 voltage channels
-        "voltages": [
-            12.0 + 0.5 * math.sin(t / 5 + i) for i in range(13)
-        ],
+        "voltages": voltages.tolist(),
         # 11 power channels (v, i, w per rail)
         "power": [
-            {
-                "rail": i,
-                "voltage": 12.0 + 0.3 * math.sin(t / 3 + i),
-                "current": 2.0 + 0.5 * abs(math.sin(t / 2 + i)),
-                "power": (12.0 + 0.3 * math.sin(t / 3 + i)) * (2.0 + 0.5 * abs(math.sin(t / 2 + i)))
-            }
-            for i in range(11)
+            {"rail": i, "voltage": v, "current": c, "power": w}
+            for i, (v, c, w) in enumerate(zip(rail_v.tolist(), rail_i.tolist(), rail_w.tolist()))
         ],
         # 9 fan channels
         "fans": [
-            {
-                "fan": i,
-                "enabled": True,
-                "duty": int(128 + 64 * abs(math.sin(t / 7 + i))),
-                "rpm": int(1500 + 500 * abs(math.sin(t / 6 + i)))
-            }
-            for i in range(9)
+            {"fan": i, "enabled": True, "duty": d, "rpm": r}
+            for i, (d, r) in enumerate(zip(duty.tolist(), rpm.tolist()))
         ],
         # Temperature sensors
-        "temps": {
-            "chip": 45.0 + 5.0 * abs(math.sin(t / 4)),
-            "ambient": 25.0 + 3.0 * abs(math.sin(t / 8)),
-            "ext1": 55.0 + 8.0 * abs(math.sin(t / 5)),
-            "ext2": 50.0 + 6.0 * abs(math.sin(t / 6)),
-            "ext3": 48.0 + 4.0 * abs(math.sin(t / 7)),
-            "ext4": 52.0 + 5.0 * abs(math.sin(t / 9)),
-        },
+        "temps": dict(zip(TEMP_NAMES, temps.tolist())),
         # Humidity
         "humidity": 45.0 + 10.0 * abs(math.sin(t / 10)),
         # System voltages
@@ -144,6 +157,17 @@ def parse_sensor_reading(reading: Dict[str, Any]) -> Dict[str, Any]:
 
     return parsed
 
+def record_prefix(device_info: Optional[Dict[str, Any]], calibration: Optional[Dict[str, Any]]) -> bytes:
+    """Serialize the per-session invariant head of every record, up to the ts_ns value"""
+    prefix = b'{"source":"benchlab.usb",'
+    # Add device info if available
+    if device_info:
+        prefix += b'"device_info":' + _dumps(device_info) + b','
+    # Add calibration info if available
+    if calibration:
+        prefix += b'"calibration":' + _dumps(calibration) + b','
+    return prefix + b'"ts_ns":'
+
 def rotate_file_if_needed(out_file: IO, base_path: pathlib.Path, current_hour: int) -> tuple[IO, int]:
     """Rotate log file hourly and compress old files"""
     new_hour = datetime.utcnow().hour
@@ -167,7 +191,7 @@ def rotate_file_if_needed(out_file: IO, base_path: pathlib.Path, current_hour: i
                 print(f"Warning: Compression failed: {e}", file=sys.stderr)
 
         # Open new file
-        new_file = base_path.open("a")
+        new_file = base_path.open("ab", buffering=WRITE_BUFFER_SIZE)
         print(f"Rotated log file to {archived_path}.gz")
         return new_file, new_hour
 
@@ -263,74 +287,71 @@ def main():
     else:
         out_file_path = root / "raw" / "benchlab.jsonl"
 
-    out = out_file_path.open("a")
+    out = out_file_path.open("ab", buffering=WRITE_BUFFER_SIZE)
     print(f"Writing telemetry to {out_file_path}")
+    prefix = record_prefix(device_info, calibration)
 
     # Main telemetry loop
     sample_count = 0
     last_fan_control = time.time()
     current_hour = datetime.utcnow().hour
+    last_flush = time.monotonic()
 
-    while True:
-        ts = clock_ns()
-
-        # Rotate log file hourly
-        out, current_hour = rotate_file_if_needed(out, out_file_path, current_hour)
+    # Unwind through the finally below so buffered samples reach disk
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
-        if client and not args.simulate:
-            try:
-                # Stream data from SDK
-                reading = client.get_sensors(args.device)
-                payload = parse_sensor_reading(reading)
-
-                # Control RGB based on latest latency (if available)
-                # This would need muxd feedback in production
-                if args.enable_rgb and "temps" in payload and "chip" in payload["temps"]:
-                    # Use temperature as proxy for now
-                    temp = payload["temps"]["chip"]
-                    control_rgb_status(client, args.device, temp, enable_rgb=True)
-
-                # Periodic fan control adjustment
-                if args.enable_auto_fan and time.time() - last_fan_control > 10:
-                    if "temps" in payload and "chip" in payload["temps"]:
-                        control_fan_thermal(
-                            client, args.device,
-                            payload["temps"]["chip"],
-                            enable_auto_fan=True
-                        )
-                        last_fan_control = time.time()
-
-            except Exception as e:
-                print(f"Error reading from device: {e}", file=sys.stderr)
+    try:
+        while True:
+            ts = clock_ns()
+
+            # Rotate log file hourly
+            out, current_hour = rotate_file_if_needed(out, out_file_path, current_hour)
+
+            if client and not args.simulate:
+                try:
+                    # Stream data from SDK
+                    reading = client.get_sensors(args.device)
+                    payload = parse_sensor_reading(reading)
+
+                    # Control RGB based on latest latency (if available)
+                    # This would need muxd feedback in production
+                    if args.enable_rgb and "temps" in payload and "chip" in payload["temps"]:
+                        # Use temperature as proxy for now
+                        temp = payload["temps"]["chip"]
+                        control_rgb_status(client, args.device, temp, enable_rgb=True)
+
+                    # Periodic fan control adjustment
+                    if args.enable_auto_fan and time.time() - last_fan_control > 10:
+                        if "temps" in payload and "chip" in payload["temps"]:
+                            control_fan_thermal(
+                                client, args.device,
+                                payload["temps"]["chip"],
+                                enable_auto_fan=True
+                            )
+                            last_fan_control = time.time()
+
+                except Exception as e:
+                    print(f"Error reading from device: {e}", file=sys.stderr)
+                    payload = generate_synthetic_data()
+            else:
+                # Simulation mode - generate synthetic data
                 payload = generate_synthetic_data()
-        else:
-            # Simulation mode - generate synthetic data
-            payload = generate_synthetic_data()
-
-        # Build telemetry record
-        rec = {
-            "ts_ns": ts,
-            "source": "benchlab.usb",
-            "kv": payload
-        }
-
-        # Add device info if available
-        if device_info:
-            rec["device_info"] = device_info
 
-        # Add calibration info if available
-        if calibration:
-            rec["calibration"] = calibration
+            # Write to JSONL: invariant prefix, then only ts_ns and kv are serialized
+            out.write(b"".join((prefix, b"%d" % ts, b',"kv":', _dumps(payload), b"}\n")))
 
-        # Write to JSONL
-        out.write(json.dumps(rec) + "\n")
-        out.flush()
+            now = time.monotonic()
+            if now - last_flush >= FLUSH_INTERVAL_S:
+                out.flush()
+                last_flush = now
 
-        sample_count += 1
-        if sample_count % 100 == 0:
-            print(f"Collected {sample_count} samples...")
+            sample_count += 1
+            if sample_count % 100 == 0:
+                print(f"Collected {sample_count} samples...")
 
-        time.sleep(0.1)  # 10 Hz sampling
+            time.sleep(0.1)  # 10 Hz sampling
+    finally:
+        out.close()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,16 @@
 #!/usr/bin/env python3
 import os, time, csv, json, pathlib, argparse
 from datetime import datetime
+from itertools import repeat
+import numpy as np
+
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+_loads = orjson.loads if HAVE_ORJSON else json.loads
 
 def session_root(data_root: pathlib.Path, session: str):
     r = data_root / "sessions" / session
@@ -24,29 +34,36 @@ def main():
     lat_file = root / "aligned" / "latency.jsonl"
     out_csv = pathlib.Path(args.out) if args.out else (root / "cx-export" / f"{args.stage_a}_to_{args.stage_b}.csv")
 
-    # Compute t0
-    t0 = None
-    rows = []
+    # Collect matching samples as columns; None latency/power become NaN
+    ts, lat, pwr = [], [], []
+    pair = [args.stage_a, args.stage_b]
     if lat_file.exists():
-        for line in open(lat_file, "r"):
-            rec = json.loads(line)
-            kv = rec.get("kv",{})
-            pair = tuple(kv.get("pair") or [])
-            if pair != (args.stage_a, args.stage_b):
-                continue
-            ts = rec["ts_aligned_ns"]
-            if t0 is None: t0 = ts
-            tsec = (ts - t0)/1e9
-            rows.append((tsec, kv.get("lat_ms"), kv.get("power_w")))
+        with open(lat_file, "rb") as f:
+            for line in f:
+                rec = _loads(line)
+                kv = rec.get("kv",{})
+                if kv.get("pair") != pair:
+                    continue
+                ts.append(rec["ts_aligned_ns"])
+                lat.append(kv.get("lat_ms"))
+                pwr.append(kv.get("power_w"))
+    ts_arr = np.asarray(ts, dtype=np.int64)
+    lat_arr = np.asarray(lat, dtype=np.float64)
+    pwr_arr = np.asarray(pwr, dtype=np.float64)
+
+    # Format each column in one vectorized call
+    tsec = (ts_arr - ts_arr[0]) / 1e9 if ts_arr.size else np.empty(0)
+    dropped = np.isnan(lat_arr).astype(np.int8)
+    t_col = np.char.mod("%.6f", tsec)
+    lat_col = np.char.mod("%.3f", np.nan_to_num(lat_arr, nan=0.0))
+    pwr_col = np.where(np.isnan(pwr_arr), "", np.char.mod("%.2f", pwr_arr))
+
     out_csv.parent.mkdir(parents=True, exist_ok=True)
     with open(out_csv, "w", newline="") as f:
         w = csv.writer(f)
         w.writerow(["TimeInSeconds","MsBetweenPresents","Dropped","Application","Note_Power_W"])
-        for t,lat,pwr in rows:
-            dropped = 1 if lat is None else 0
-            w.writerow([f"{t:.6f}", f"{(lat or 0):.3f}", dropped, args.application, "" if pwr is None else f"{pwr:.2f}"])
-
-    print(f"wrote {out_csv} with {len(rows)} rows")
+        w.writerows(zip(t_col.tolist(), lat_col.tolist(), dropped.tolist(), repeat(args.application), pwr_col.tolist()))
+    print(f"wrote {out_csv} with {ts_arr.size} rows")
 
 if __name__ == "__main__":
     main()
@@ -1,37 +1,112 @@
-from collections import deque
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except Exception:
+    HAVE_NUMBA = False
 
 WINDOW_NS = 2_000_000_000  # pair within 2s
 MAX_BUFFER_SIZE = 100  # prevent unbounded memory growth
 
+def _window(ring, head, n):
+    """The n live timestamps of a ring starting at counter head, oldest first, as ints"""
+    s = head % ring.size
+    if s + n <= ring.size:
+        return ring[s:s + n].tolist()
+    return ring[s:].tolist() + ring[:s + n - ring.size].tolist()
+
+def _pair_step(tsA, headA, nA, tsB, headB, nB, window_ns, out_t, out_lat):
+    """
+    Greedy two-pointer match over the live part of both rings. Writes matches into
+    out_t/out_lat and returns (consumed A, consumed B, matches written).
+    """
+    capA = len(tsA); capB = len(tsB)
+    i = 0; j = 0; n = 0
+    while i < nA and j < nB:
+        ta = tsA[(headA + i) % capA]; tb = tsB[(headB + j) % capB]
+        if tb < ta and (ta - tb) > window_ns:
+            j += 1; continue
+        if ta < tb and (tb - ta) > window_ns:
+            i += 1; continue
+        out_t[n] = ta
+        out_lat[n] = (tb - ta) / 1e6
+        i += 1; j += 1; n += 1
+    return i, j, n
+
+if HAVE_NUMBA:
+    # Compiled eagerly so the first pair doesn't pay JIT latency; no on-disk cache
+    # because the service runs with a read-only install tree.
+    _pair_step_jit = njit("UniTuple(int64, 3)(int64[::1], int64, int64, int64[::1], int64, int64,"
+                          " int64, int64[::1], float64[::1])", nogil=True)(_pair_step)
+
+def _push(ring, head, tail, ts):
+    """Append a run of timestamps to a ring, dropping the oldest on overflow; returns (head, tail)"""
+    cap = ring.size
+    n = len(ts)
+    if n > cap:
+        tail += n - cap  # only the newest cap entries can survive
+        ts = ts[n - cap:]; n = cap
+    s = tail % cap
+    k = min(n, cap - s)
+    ring[s:s + k] = ts[:k]
+    ring[:n - k] = ts[k:]
+    tail += n
+    return max(head, tail - cap), tail
+
 class Pairer:
-    def __init__(self, a="ingress", b="encoded"):
+    def __init__(self, a="ingress", b="encoded", maxlen=MAX_BUFFER_SIZE):
         self.a, self.b = a, b
-        self.bufA, self.bufB = deque(), deque()
+        # Preallocated rings of ts_aligned_ns per stage: memory is fixed at 8 bytes per
+        # slot regardless of record size. head/tail are monotonically increasing
+        # counters; a record lives in slot counter % maxlen.
+        self.maxlen = maxlen
+        self.tsA = np.empty(maxlen, dtype=np.int64)
+        self.tsB = np.empty(maxlen, dtype=np.int64)
+        self.headA = self.tailA = 0
+        self.headB = self.tailB = 0
 
     def add(self, rec):
-        stage = rec.get("kv",{}).get("stage")
+        self.add_stage(rec.get("kv",{}).get("stage"), rec["ts_aligned_ns"])
+
+    def add_stage(self, stage, ts_aligned_ns):
+        if stage == self.a:
+            if self.tailA - self.headA >= self.maxlen:
+                self.headA += 1  # drop oldest to prevent unbounded growth
+            self.tsA[self.tailA % self.maxlen] = ts_aligned_ns
+            self.tailA += 1
+        elif stage == self.b:
+            if self.tailB - self.headB >= self.maxlen:
+                self.headB += 1  # drop oldest to prevent unbounded growth
+            self.tsB[self.tailB % self.maxlen] = ts_aligned_ns
+            self.tailB += 1
+
+    def add_many(self, stage, ts):
+        """add_stage for a run of ts_aligned_ns of one stage, oldest first"""
+        if not len(ts):
+            return
         if stage == self.a:
-            if len(self.bufA) >= MAX_BUFFER_SIZE:
-                self.bufA.popleft()  # drop oldest to prevent unbounded growth
-            self.bufA.append(rec)
+            self.headA, self.tailA = _push(self.tsA, self.headA, self.tailA, ts)
         elif stage == self.b:
-            if len(self.bufB) >= MAX_BUFFER_SIZE:
-                self.bufB.popleft()  # drop oldest to prevent unbounded growth
-            self.bufB.append(rec)
+            self.headB, self.tailB = _push(self.tsB, self.headB, self.tailB, ts)
 
     def pairs(self):
-        out=[]
-        while self.bufA and self.bufB:
-            A=self.bufA[0]; B=self.bufB[0]
-            ta=A["ts_aligned_ns"]; tb=B["ts_aligned_ns"]
-            if tb < ta and (ta - tb) > WINDOW_NS:
-                self.bufB.popleft(); continue
-            if ta < tb and (tb - ta) > WINDOW_NS:
-                self.bufA.popleft(); continue
-            self.bufA.popleft(); self.bufB.popleft()
-            out.append({
-              "t_ns": ta,
-              "lat_ms": (tb - ta)/1e6,
-              "pair": (self.a, self.b)
-            })
-        return out
+        nA = self.tailA - self.headA; nB = self.tailB - self.headB
+        if not nA or not nB:
+            return []
+        k = min(nA, nB)
+        if HAVE_NUMBA:
+            out_t = np.empty(k, dtype=np.int64); out_lat = np.empty(k, dtype=np.float64)
+            i, j, n = _pair_step_jit(self.tsA, self.headA, nA, self.tsB, self.headB, nB,
+                                     WINDOW_NS, out_t, out_lat)
+            out_t = out_t[:n].tolist(); out_lat = out_lat[:n].tolist()
+        else:
+            # Plain-int windows are much cheaper to index from Python than the arrays
+            out_t = [0] * k; out_lat = [0.0] * k
+            i, j, n = _pair_step(_window(self.tsA, self.headA, nA), 0, nA,
+                                 _window(self.tsB, self.headB, nB), 0, nB,
+                                 WINDOW_NS, out_t, out_lat)
+            del out_t[n:], out_lat[n:]
+        self.headA += i; self.headB += j
+        pair = (self.a, self.b)
+        return [{"t_ns": t, "lat_ms": lat, "pair": pair} for t, lat in zip(out_t, out_lat)]
@@ -1,9 +1,56 @@
 #!/usr/bin/env python3
-import os, time, json, pathlib, argparse, socket, gzip, sys
+import os, time, json, pathlib, argparse, socket, gzip, sys, signal, queue, threading
 from datetime import datetime
-from typing import IO
 from prometheus_client import start_http_server, Gauge, Counter, Info
 from .latency import Pairer
+from .metrics_page import MetricsPage, serve_metrics_page
+
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+try:
+    import simdjson
+    HAVE_SIMDJSON = True
+except Exception:
+    HAVE_SIMDJSON = False
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    HAVE_INOTIFY = True
+except Exception:
+    HAVE_INOTIFY = False
+
+_loads = orjson.loads if HAVE_ORJSON else json.loads
+
+# simdjson hands back lazy proxies rather than lists/dicts
+_ARRAY_TYPES = (list, simdjson.Array) if HAVE_SIMDJSON else (list,)
+_OBJECT_TYPES = (dict, simdjson.Object) if HAVE_SIMDJSON else (dict,)
+
+IDLE_WAIT_S = 1.0  # longest sleep between passes when nothing is pending
+WORKER_CHECK_S = 0.2  # how often the main thread checks for shutdown and dead stages
+WRITEV_BATCH = 64  # aligned records per writev
+WRITEV_MAX_AGE_S = 0.020  # upper bound on how long a record waits for its batch
+PAIR_BATCH = 1024  # pipeline events handed to the Pairer per matching call
+PAIR_RING_SIZE = 8192  # per-stage capacity; leaves room for a full batch of one stage
+READ_CHUNK_SIZE = 1 << 16
+POLL_INTERVAL_S = 0.05  # wakeup period when inotify is unavailable
+# Consumed raw input is dropped from the page cache in steps of this size, trailing
+# the read offset by one step so the page the producer is appending to stays cached
+FADVISE_STEP = 1 << 20
+HAVE_FADVISE = hasattr(os, "posix_fadvise")
+SIMDJSON_MAX_LINE = 4 << 20  # larger records go through the stdlib/orjson path
+
+# Aligned latency records have a fixed schema, so they are formatted directly
+ALIGNED_LATENCY_TPL = (b'{"ts_aligned_ns":%%d,"source":"metric.latency",'
+                       b'"kv":{"lat_ms":%%.6f,"pair":%s,"power_w":%%s}}\n')
+
+def aligned_latency_template(a: str, b: str) -> bytes:
+    """ALIGNED_LATENCY_TPL with the stage pair JSON-escaped and baked in once"""
+    pair = json.dumps([a, b], separators=(",", ":")).encode()
+    return ALIGNED_LATENCY_TPL % pair.replace(b"%", b"%%")
 
 def clock_ns():
     return time.clock_gettime_ns(time.CLOCK_MONOTONIC_RAW)
@@ -14,16 +61,352 @@ def session_root(data_root: pathlib.Path, session: str):
     (r / "aligned").mkdir(parents=True, exist_ok=True)
     return r
 
-def tail_file(path):
-    with open(path, "r") as f:
-        f.seek(0, os.SEEK_END)
-        while True:
-            line = f.readline()
-            if not line:
-                time.sleep(0.05); continue
-            yield line
-
-def rotate_file_if_needed(out_file: IO, base_path: pathlib.Path, current_hour: int) -> tuple[IO, int]:
+class Tailer:
+    """Follows a JSONL file from its current end without blocking"""
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        st = os.fstat(self.fd)
+        self.ino = st.st_ino
+        # Positional reads from a tracked offset into one preallocated buffer: no
+        # per-read bytes object and no file-position syscalls
+        self.offset = st.st_size
+        self.dropped = st.st_size  # page cache below this offset has been released
+        self.rbuf = bytearray(READ_CHUNK_SIZE)
+        self.rview = memoryview(self.rbuf)
+        self.buf = bytearray()
+
+    def reopen_if_replaced(self) -> list[bytes]:
+        """
+        Follow a producer that recreated its file. Returns the lines the producer appended
+        to the old file since the last read_lines(), drained before switching over.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if st.st_ino != self.ino:
+            lines = self.read_lines()
+            os.close(self.fd)
+            self.fd = os.open(self.path, os.O_RDONLY)  # new file: read it from the start
+            self.ino = os.fstat(self.fd).st_ino
+            self.offset = self.dropped = 0
+            self.buf.clear()
+            return lines
+        return []
+
+    def _read(self) -> int:
+        n = os.preadv(self.fd, [self.rbuf], self.offset)
+        self.offset += n
+        self.buf += self.rview[:n]
+        return n
+
+    def _release_consumed(self):
+        """Keep a long session's raw file from filling the page cache behind the tailer"""
+        end = self.offset - FADVISE_STEP
+        if not HAVE_FADVISE or end - self.dropped < FADVISE_STEP:
+            return
+        try:
+            os.posix_fadvise(self.fd, self.dropped, end - self.dropped, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass  # advisory only
+        self.dropped = end
+
+    def read_lines(self) -> list[bytes]:
+        """Complete lines appended since the last call; a trailing partial line is held back"""
+        n = self._read()
+        if not n and os.fstat(self.fd).st_size < self.offset:
+            # truncated in place: start over from the top
+            self.offset = self.dropped = 0
+            self.buf.clear()
+            n = self._read()
+        while n == READ_CHUNK_SIZE:
+            n = self._read()
+        self._release_consumed()
+        lines = []
+        start = 0
+        with memoryview(self.buf) as mv:
+            while (end := self.buf.find(b"\n", start)) >= 0:
+                lines.append(bytes(mv[start:end]))
+                start = end + 1
+        del self.buf[:start]
+        return lines
+
+class ChangeWaiter:
+    """Blocks until one of the tailed files is written to, or polls if inotify is unavailable"""
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.inotify = None
+        self.dir_wds = set()
+        if HAVE_INOTIFY:
+            try:
+                self.inotify = INotify()
+                self._watch_files()
+                # A producer that recreates its file leaves the MODIFY watch on a dead inode
+                for d in {p.parent for p in self.paths}:
+                    self.dir_wds.add(self.inotify.add_watch(str(d), inotify_flags.CREATE | inotify_flags.MOVED_TO))
+            except OSError as e:
+                print(f"Warning: inotify unavailable, polling instead: {e}", file=sys.stderr)
+                self.inotify = None
+
+    def _watch_files(self):
+        for p in self.paths:
+            try:
+                self.inotify.add_watch(str(p), inotify_flags.MODIFY)
+            except FileNotFoundError:
+                pass  # picked up by the directory watch once it is recreated
+
+    def wait(self, timeout_s: float) -> bool:
+        """Returns True when the tailed files may have been replaced and should be re-checked"""
+        if self.inotify is None:
+            time.sleep(POLL_INTERVAL_S)
+            return True
+        events = self.inotify.read(timeout=int(timeout_s * 1000))
+        if any(e.wd in self.dir_wds for e in events):
+            self._watch_files()
+            return True
+        return False
+
+class LatencyAligner:
+    """Buffers pipeline stage timestamps and matches them in batches, writing aligned latency records"""
+    def __init__(self, a: str, b: str, gauge):
+        self.a, self.b = a, b
+        self.pairer = Pairer(a=a, b=b, maxlen=PAIR_RING_SIZE)
+        self.tpl = aligned_latency_template(a, b)
+        self.gauge = gauge
+        self.ts_a = []
+        self.ts_b = []
+
+    def add(self, stage, ts_aligned_ns) -> bool:
+        """Queue one event; True once a full batch is waiting"""
+        if ts_aligned_ns is None:
+            return False
+        if stage == self.a:
+            self.ts_a.append(ts_aligned_ns)
+        elif stage == self.b:
+            self.ts_b.append(ts_aligned_ns)
+        return len(self.ts_a) + len(self.ts_b) >= PAIR_BATCH
+
+    def flush(self, out: "AppendWriter", power_w):
+        if not (self.ts_a or self.ts_b):
+            return
+        self.pairer.add_many(self.a, self.ts_a)
+        self.pairer.add_many(self.b, self.ts_b)
+        self.ts_a.clear()
+        self.ts_b.clear()
+        power = b"null" if power_w is None else b"%.3f" % power_w
+        lat_ms = None
+        for pr in self.pairer.pairs():
+            lat_ms = pr["lat_ms"]
+            out.write(self.tpl % (pr["t_ns"], lat_ms, power))
+        if lat_ms is not None:
+            self.gauge.set(lat_ms)  # only the newest pair is visible to a scrape anyway
+
+class RecordParser:
+    """Decodes JSONL records, lazily through a reused simdjson parser when available"""
+    def __init__(self):
+        self.parser = simdjson.Parser() if HAVE_SIMDJSON else None
+
+    def parse(self, line: bytes):
+        if self.parser is not None and len(line) <= SIMDJSON_MAX_LINE:
+            return self.parser.parse(line)
+        return _loads(line)
+
+# Channel counts reported by a BENCHLAB device
+N_VOLTAGES = 13
+N_RAILS = 11
+N_FANS = 9
+
+def _bind(gauge, label, n):
+    """One pre-bound child per index 0..n-1; .labels() hashes a label tuple on every call"""
+    return [gauge.labels(**{label: str(i)}) for i in range(n)]
+
+def _publish_changed(last, ch, row, handles):
+    """
+    Set only the fields of channel ch whose value moved since the previous sample:
+    Gauge.set takes a lock and dominates export cost, while most channels hold steady.
+    last[ch] is updated in place; handles[f][ch] is the child for field f.
+    """
+    prev = last[ch]
+    for f, value in enumerate(row):
+        if value != prev[f]:
+            prev[f] = value
+            handles[f][ch].set(value)
+
+class BenchlabExporter:
+    """Publishes BENCHLAB sensor records as Prometheus metrics and tracks the latest total power"""
+    def __init__(self, gauge=Gauge, info=Info):
+        # Voltage channels (13)
+        self.g_voltage = gauge("benchlab_voltage_v", "Voltage measurement", ["channel"])
+
+        # Power channels (11 rails)
+        self.g_power_voltage = gauge("benchlab_power_voltage_v", "Power rail voltage", ["rail"])
+        self.g_power_current = gauge("benchlab_power_current_a", "Power rail current", ["rail"])
+        self.g_power_watts = gauge("benchlab_power_w", "Power rail watts", ["rail"])
+
+        # Fan channels (9)
+        self.g_fan_enabled = gauge("benchlab_fan_enabled", "Fan enabled status", ["fan"])
+        self.g_fan_duty = gauge("benchlab_fan_duty", "Fan duty cycle (0-255)", ["fan"])
+        self.g_fan_rpm = gauge("benchlab_fan_rpm", "Fan speed in RPM", ["fan"])
+
+        # Temperature sensors (6)
+        self.g_temp = gauge("benchlab_temp_c", "Temperature in Celsius", ["sensor"])
+
+        # Environmental
+        self.g_humidity = gauge("benchlab_humidity_pct", "Relative humidity percentage")
+
+        # System voltages
+        self.g_vdd = gauge("benchlab_vdd_v", "Digital supply voltage")
+        self.g_vref = gauge("benchlab_vref_v", "Reference voltage")
+
+        # Device info
+        self.i_device = info("benchlab_device", "BENCHLAB device information")
+        self.g_calibration_status = gauge("benchlab_calibration_valid", "Calibration status (1=valid, 0=invalid)")
+
+        # Total system power (sum of all rails)
+        self.g_total_power = gauge("benchlab_total_power_w", "Total system power (all rails)")
+
+        self.volt_ch = _bind(self.g_voltage, "channel", N_VOLTAGES)
+        self.rail_v = _bind(self.g_power_voltage, "rail", N_RAILS)
+        self.rail_i = _bind(self.g_power_current, "rail", N_RAILS)
+        self.rail_w = _bind(self.g_power_watts, "rail", N_RAILS)
+        self.fan_en = _bind(self.g_fan_enabled, "fan", N_FANS)
+        self.fan_duty = _bind(self.g_fan_duty, "fan", N_FANS)
+        self.fan_rpm = _bind(self.g_fan_rpm, "fan", N_FANS)
+        self.temp_by_name = {}  # sensor names vary by firmware, so bound on first sight
+
+        # Last published value per channel and field; NaN never compares equal, so the
+        # first sample sets everything
+        nan = float("nan")
+        self.volts = [[nan] for _ in range(N_VOLTAGES)]
+        self.rails = [[nan] * 3 for _ in range(N_RAILS)]
+        self.fans = [[nan] * 3 for _ in range(N_FANS)]
+        self.volt_handles = (self.volt_ch,)
+        self.rail_handles = (self.rail_v, self.rail_i, self.rail_w)
+        self.fan_handles = (self.fan_en, self.fan_duty, self.fan_rpm)
+
+        self.last_power = None
+        self.device_info_set = False
+
+    def export(self, rec):
+        kv = rec.get("kv") or {}
+
+        # Handle legacy single power value
+        p = kv.get("p_sys") or kv.get("power_w")
+        if p is not None:
+            self.last_power = float(p)
+
+        # Export voltage channels
+        if "voltages" in kv and isinstance(kv["voltages"], _ARRAY_TYPES):
+            for i, v in enumerate(kv["voltages"]):
+                if i < N_VOLTAGES:
+                    _publish_changed(self.volts, i, (float(v),), self.volt_handles)
+                else:
+                    self.g_voltage.labels(channel=str(i)).set(float(v))
+
+        # Export power channels (11 rails)
+        total_power = 0.0
+        if "power" in kv and isinstance(kv["power"], _ARRAY_TYPES):
+            for rail_data in kv["power"]:
+                rail = rail_data.get("rail", 0)
+                row = (float(rail_data.get("voltage", 0)), float(rail_data.get("current", 0)),
+                       float(rail_data.get("power", 0)))
+                total_power += row[2]
+                if type(rail) is int and 0 <= rail < N_RAILS:
+                    _publish_changed(self.rails, rail, row, self.rail_handles)
+                else:
+                    for gauge, value in zip((self.g_power_voltage, self.g_power_current, self.g_power_watts), row):
+                        gauge.labels(rail=str(rail)).set(value)
+
+            self.g_total_power.set(total_power)
+            self.last_power = total_power  # Use total power for latency correlation
+
+        # Export fan data (9 channels)
+        if "fans" in kv and isinstance(kv["fans"], _ARRAY_TYPES):
+            for fan_data in kv["fans"]:
+                fan = fan_data.get("fan", 0)
+                row = (1.0 if fan_data.get("enabled") else 0.0, float(fan_data.get("duty", 0)),
+                       float(fan_data.get("rpm", 0)))
+                if type(fan) is int and 0 <= fan < N_FANS:
+                    _publish_changed(self.fans, fan, row, self.fan_handles)
+                else:
+                    for gauge, value in zip((self.g_fan_enabled, self.g_fan_duty, self.g_fan_rpm), row):
+                        gauge.labels(fan=str(fan)).set(value)
+
+        # Export temperature sensors
+        if "temps" in kv and isinstance(kv["temps"], _OBJECT_TYPES):
+            temp_by_name = self.temp_by_name
+            for sensor_name, temp_val in kv["temps"].items():
+                g = temp_by_name.get(sensor_name)
+                if g is None:
+                    g = temp_by_name[sensor_name] = self.g_temp.labels(sensor=sensor_name)
+                g.set(float(temp_val))
+
+        # Export humidity
+        if "humidity" in kv:
+            self.g_humidity.set(float(kv["humidity"]))
+
+        # Export system voltages
+        if "vdd" in kv:
+            self.g_vdd.set(float(kv["vdd"]))
+        if "vref" in kv:
+            self.g_vref.set(float(kv["vref"]))
+
+        # Export device info (once)
+        if not self.device_info_set and "device_info" in rec:
+            dev_info = rec["device_info"]
+            self.i_device.info({
+                "uid": str(dev_info.get("uid", "unknown")),
+                "name": str(dev_info.get("name", "unknown")),
+                "firmware": str(dev_info.get("firmware", "unknown")),
+                "vendor_id": str(dev_info.get("vendor_id", 0)),
+                "product_id": str(dev_info.get("product_id", 0)),
+            })
+            self.device_info_set = True
+
+        # Export calibration status
+        if "calibration" in rec:
+            cal = rec["calibration"]
+            self.g_calibration_status.set(1 if cal.get("status") == "valid" else 0)
+
+class AppendWriter:
+    """O_APPEND JSONL writer that hands batches of pre-serialized lines to one writev"""
+    def __init__(self, path: pathlib.Path):
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.pending = []
+        self.oldest = 0.0
+
+    def write(self, line: bytes):
+        if not self.pending:
+            self.oldest = time.monotonic()
+        self.pending.append(line)
+        if len(self.pending) >= WRITEV_BATCH:
+            self.flush()
+
+    def due_in(self, now: float) -> float:
+        """Seconds until the pending batch must go out (IDLE_WAIT_S when empty)"""
+        if not self.pending:
+            return IDLE_WAIT_S
+        return max(0.0, self.oldest + WRITEV_MAX_AGE_S - now)
+
+    def flush(self):
+        if not self.pending:
+            return
+        bufs, self.pending = self.pending, []
+        n = os.writev(self.fd, bufs)
+        if n < sum(map(len, bufs)):
+            # short write (e.g. disk full or signal); finish it so lines stay whole
+            rest = memoryview(b"".join(bufs))[n:]
+            while rest:
+                rest = rest[os.write(self.fd, rest):]
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            os.close(self.fd)
+
+def rotate_file_if_needed(out_file: AppendWriter, base_path: pathlib.Path, current_hour: int) -> tuple[AppendWriter, int]:
     """Rotate log file hourly and compress old files"""
     new_hour = datetime.utcnow().hour
     if new_hour != current_hour:
@@ -46,12 +429,102 @@ def rotate_file_if_needed(out_file: IO, base_path: pathlib.Path, current_hour: i
                 print(f"Warning: Compression failed: {e}", file=sys.stderr)
 
         # Open new file
-        new_file = base_path.open("a")
+        new_file = AppendWriter(base_path)
         print(f"Rotated log file to {archived_path}.gz")
         return new_file, new_hour
 
     return out_file, current_hour
 
+def pin_current_thread(cpu):
+    """Pin the calling thread to one CPU (Linux applies sched_setaffinity(0) per thread)"""
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError as e:
+        print(f"Warning: could not pin to CPU {cpu}: {e}", file=sys.stderr)
+
+def tail_worker(key: str, tailer: Tailer, waiter: ChangeWaiter, out_q, stop, cpu):
+    """Stage 1: hand every batch of lines appended to one raw file to the parser"""
+    pin_current_thread(cpu)
+    while not stop.is_set():
+        lines = tailer.read_lines()
+        if lines:
+            out_q.put((key, lines))
+        if waiter.wait(IDLE_WAIT_S):
+            # anything already in the new file is read next pass
+            lines = tailer.reopen_if_replaced()
+            if lines:
+                out_q.put((key, lines))
+    # shutting down: hand over what was appended since the last pass
+    lines = tailer.read_lines()
+    if lines:
+        out_q.put((key, lines))
+
+def parse_worker(in_q, out_q, benchlab: BenchlabExporter, cpu):
+    """
+    Stage 2: decode records, publish BENCHLAB gauges and pass pipeline (stage, ts) events on.
+    simdjson proxies never leave this thread; only plain values are queued.
+    """
+    pin_current_thread(cpu)
+    records = RecordParser()
+    while True:
+        item = in_q.get()
+        if item is None:
+            out_q.put(None)
+            return
+        key, lines = item
+        events = []
+        for line in lines:
+            try:
+                rec = records.parse(line)
+            except Exception:
+                continue
+
+            try:
+                if key == "benchlab":
+                    benchlab.export(rec)
+
+                elif key == "pipeline":
+                    # ts_aligned_ns = ts_ns for now; extend with drift correction
+                    events.append(((rec.get("kv") or {}).get("stage"), rec.get("ts_ns")))
+            except Exception:
+                pass  # malformed record: skip it rather than stall the pipeline
+
+            del rec  # simdjson proxies must not outlive the next parse
+        if events:
+            out_q.put((events, benchlab.last_power))
+
+def export_worker(in_q, aligner: LatencyAligner, path: pathlib.Path, cpu):
+    """Stage 3: pair pipeline events and append aligned latency records, rotating hourly"""
+    pin_current_thread(cpu)
+    out = AppendWriter(path)
+    current_hour = datetime.utcnow().hour
+    try:
+        while True:
+            out, current_hour = rotate_file_if_needed(out, path, current_hour)
+
+            wait_s = out.due_in(time.monotonic())
+            if wait_s <= 0:
+                out.flush()
+                wait_s = IDLE_WAIT_S
+            try:
+                item = in_q.get(timeout=wait_s)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            events, power_w = item
+            for stage, ts in events:
+                if aligner.add(stage, ts):
+                    aligner.flush(out, power_w)
+            aligner.flush(out, power_w)
+    finally:
+        out.close()
+
+def parse_cpus(s: str) -> list[int]:
+    return [int(c) for c in s.split(",") if c.strip()]
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--data-root", default=os.environ.get("BENCHLAB_DATA_ROOT","/var/log/benchlab"))
@@ -60,6 +533,10 @@ def main():
     ap.add_argument("--prom-bind", default=os.environ.get("BENCHLAB_PROM","0.0.0.0:9109"))
     ap.add_argument("--daemon", action="store_true")
     ap.add_argument("--simulate", action="store_true", help="if true, create synthetic raw files if missing")
+    ap.add_argument("--metrics-page", action="store_true",
+                    help="serve /metrics from a pre-rendered page patched in place instead of prometheus_client")
+    ap.add_argument("--cpus", type=parse_cpus, default=None,
+                    help="comma-separated CPUs for the tail, parse and export threads, e.g. 2,3,4")
     args = ap.parse_args()
 
     data_root = pathlib.Path(args.data_root)
@@ -68,161 +545,80 @@ def main():
     raw_telemetry = root / "raw" / "telemetry.jsonl"
     raw_benchlab = root / "raw" / "benchlab.jsonl"
     aligned_latency_path = root / "aligned" / "latency.jsonl"
-    aligned_latency = aligned_latency_path.open("a")
 
     # Prometheus - Pipeline metrics
     host = socket.gethostname()
     bind_host, bind_port = args.prom_bind.split(":")
-    start_http_server(int(bind_port), addr=bind_host)
-
-    g_latency = Gauge("benchlab_pipeline_latency_ms","Latency in ms", ["pair"])
-    c_dropped = Counter("benchlab_pipeline_dropped","Unpaired pipeline events")
-
-    # Prometheus - BENCHLAB comprehensive metrics
-    # Voltage channels (13)
-    g_voltage = Gauge("benchlab_voltage_v", "Voltage measurement", ["channel"])
-
-    # Power channels (11 rails)
-    g_power_voltage = Gauge("benchlab_power_voltage_v", "Power rail voltage", ["rail"])
-    g_power_current = Gauge("benchlab_power_current_a", "Power rail current", ["rail"])
-    g_power_watts = Gauge("benchlab_power_w", "Power rail watts", ["rail"])
-
-    # Fan channels (9)
-    g_fan_enabled = Gauge("benchlab_fan_enabled", "Fan enabled status", ["fan"])
-    g_fan_duty = Gauge("benchlab_fan_duty", "Fan duty cycle (0-255)", ["fan"])
-    g_fan_rpm = Gauge("benchlab_fan_rpm", "Fan speed in RPM", ["fan"])
+    if args.metrics_page:
+        # Scrapes copy one buffer instead of walking every metric object; the page has
+        # only muxd's own metrics (no process_/python_ collectors)
+        page = MetricsPage()
+        gauge, counter, info = page.gauge, page.counter, page.info
+        serve_metrics_page(page, bind_host, int(bind_port))
+    else:
+        gauge, counter, info = Gauge, Counter, Info
+        start_http_server(int(bind_port), addr=bind_host)
 
-    # Temperature sensors (6)
-    g_temp = Gauge("benchlab_temp_c", "Temperature in Celsius", ["sensor"])
+    g_latency = gauge("benchlab_pipeline_latency_ms","Latency in ms", ["pair"])
+    # The pair is fixed for the life of the process; bind its child once
+    g_latency_pair = g_latency.labels(str((args.pair[0], args.pair[1])))
+    c_dropped = counter("benchlab_pipeline_dropped","Unpaired pipeline events")
 
-    # Environmental
-    g_humidity = Gauge("benchlab_humidity_pct", "Relative humidity percentage")
+    benchlab = BenchlabExporter(gauge, info)
 
-    # System voltages
-    g_vdd = Gauge("benchlab_vdd_v", "Digital supply voltage")
-    g_vref = Gauge("benchlab_vref_v", "Reference voltage")
-
-    # Device info
-    i_device = Info("benchlab_device", "BENCHLAB device information")
-    g_calibration_status = Gauge("benchlab_calibration_valid", "Calibration status (1=valid, 0=invalid)")
-
-    # Total system power (sum of all rails)
-    g_total_power = Gauge("benchlab_total_power_w", "Total system power (all rails)")
-
-    pairer = Pairer(a=args.pair[0], b=args.pair[1])
+    aligner = LatencyAligner(args.pair[0], args.pair[1], g_latency_pair)
 
     # Ensure raw files exist
     for p in [raw_pipeline, raw_telemetry, raw_benchlab]:
         p.parent.mkdir(parents=True, exist_ok=True)
         p.touch(exist_ok=True)
 
-    # Tailing
-    tails = {
-        "pipeline": tail_file(raw_pipeline),
-        "telemetry": tail_file(raw_telemetry),
-        "benchlab": tail_file(raw_benchlab)
-    }
-
-    last_power = None
-    device_info_set = False
-    current_hour = datetime.utcnow().hour
-
-    while True:
-        # Rotate log file hourly
-        aligned_latency, current_hour = rotate_file_if_needed(aligned_latency, aligned_latency_path, current_hour)
-
-        # multiplex read (simple round-robin)
-        for key, gen in list(tails.items()):
-            try:
-                line = next(gen)
-            except StopIteration:
-                continue
-            try:
-                rec = json.loads(line)
-            except Exception:
-                continue
-
-            rec["ts_aligned_ns"] = rec["ts_ns"]  # placeholder; extend with drift correction
-
-            if key == "benchlab":
-                kv = rec.get("kv", {})
-
-                # Handle legacy single power value
-                p = kv.get("p_sys") or kv.get("power_w")
-                if p is not None:
-                    last_power = float(p)
-
-                # Export voltage channels
-                if "voltages" in kv and isinstance(kv["voltages"], list):
-                    for i, v in enumerate(kv["voltages"]):
-                        g_voltage.labels(channel=str(i)).set(float(v))
-
-                # Export power channels (11 rails)
-                total_power = 0.0
-                if "power" in kv and isinstance(kv["power"], list):
-                    for rail_data in kv["power"]:
-                        rail = str(rail_data.get("rail", 0))
-                        g_power_voltage.labels(rail=rail).set(float(rail_data.get("voltage", 0)))
-                        g_power_current.labels(rail=rail).set(float(rail_data.get("current", 0)))
-
-                        power_w = float(rail_data.get("power", 0))
-                        g_power_watts.labels(rail=rail).set(power_w)
-                        total_power += power_w
-
-                    g_total_power.set(total_power)
-                    last_power = total_power  # Use total power for latency correlation
-
-                # Export fan data (9 channels)
-                if "fans" in kv and isinstance(kv["fans"], list):
-                    for fan_data in kv["fans"]:
-                        fan = str(fan_data.get("fan", 0))
-                        g_fan_enabled.labels(fan=fan).set(1 if fan_data.get("enabled") else 0)
-                        g_fan_duty.labels(fan=fan).set(float(fan_data.get("duty", 0)))
-                        g_fan_rpm.labels(fan=fan).set(float(fan_data.get("rpm", 0)))
-
-                # Export temperature sensors
-                if "temps" in kv and isinstance(kv["temps"], dict):
-                    for sensor_name, temp_val in kv["temps"].items():
-                        g_temp.labels(sensor=sensor_name).set(float(temp_val))
-
-                # Export humidity
-                if "humidity" in kv:
-                    g_humidity.set(float(kv["humidity"]))
-
-                # Export system voltages
-                if "vdd" in kv:
-                    g_vdd.set(float(kv["vdd"]))
-                if "vref" in kv:
-                    g_vref.set(float(kv["vref"]))
-
-                # Export device info (once)
-                if not device_info_set and "device_info" in rec:
-                    dev_info = rec["device_info"]
-                    i_device.info({
-                        "uid": str(dev_info.get("uid", "unknown")),
-                        "name": str(dev_info.get("name", "unknown")),
-                        "firmware": str(dev_info.get("firmware", "unknown")),
-                        "vendor_id": str(dev_info.get("vendor_id", 0)),
-                        "product_id": str(dev_info.get("product_id", 0)),
-                    })
-                    device_info_set = True
-
-                # Export calibration status
-                if "calibration" in rec:
-                    cal = rec["calibration"]
-                    g_calibration_status.set(1 if cal.get("status") == "valid" else 0)
-
-            elif key == "pipeline":
-                pairer.add(rec)
-                for pr in pairer.pairs():
-                    pr["ts_aligned_ns"] = pr.pop("t_ns")
-                    pr["source"] = "metric.latency"
-                    pr["kv"] = {"lat_ms": pr.pop("lat_ms"), "pair": pr.pop("pair"), "power_w": last_power}
-                    aligned_latency.write(json.dumps(pr) + "\n")
-                    aligned_latency.flush()
-                    g_latency.labels(str(pr["kv"]["pair"])).set(pr["kv"]["lat_ms"])
-
-        time.sleep(0.01)
+    # tail -> parse -> export, connected by queues; the tail threads share one CPU since
+    # they mostly sleep in the change waiter
+    cpus = args.cpus or [None]
+    tail_cpu, parse_cpu, export_cpu = (cpus[i % len(cpus)] for i in range(3))
+    stop = threading.Event()
+    lines_q = queue.SimpleQueue()
+    events_q = queue.SimpleQueue()
+
+    tailers = []
+    for key, path in (("pipeline", raw_pipeline), ("telemetry", raw_telemetry), ("benchlab", raw_benchlab)):
+        t = threading.Thread(target=tail_worker, name=f"tail-{key}", daemon=True,
+                             args=(key, Tailer(path), ChangeWaiter([path]), lines_q, stop, tail_cpu))
+        tailers.append(t)
+    parser = threading.Thread(target=parse_worker, name="parse", daemon=True,
+                              args=(lines_q, events_q, benchlab, parse_cpu))
+    exporter = threading.Thread(target=export_worker, name="export",
+                                args=(events_q, aligner, aligned_latency_path, export_cpu))
+
+    # SIGTERM only requests shutdown; the main thread then drains the stages in order
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    workers = (exporter, parser, *tailers)
+    for t in workers:
+        t.start()
+    failed = False
+    try:
+        while not stop.is_set():
+            time.sleep(WORKER_CHECK_S)
+            dead = [t.name for t in workers if not t.is_alive()]
+            if dead and not stop.is_set():
+                # a stage that died would leave the rest running but stalled; exit so a
+                # supervisor restarts muxd
+                print(f"Error: worker thread(s) {', '.join(dead)} exited, shutting down", file=sys.stderr)
+                failed = True
+                break
+    finally:
+        stop.set()
+        for t in tailers:
+            t.join()
+        lines_q.put(None)  # parse drains what is queued, then stops export in turn
+        while exporter.is_alive():
+            if not parser.is_alive():
+                events_q.put(None)  # parse is gone: stop export directly
+            exporter.join(WORKER_CHECK_S)
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,143 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Every sample value occupies a fixed-width, right-aligned field so an update is a
+# same-length slice assignment into the pre-rendered page. 24 fits any float repr.
+VALUE_WIDTH = 24
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _format_value(x) -> bytes:
+    x = float(x)
+    if x - x == 0:  # finite
+        return b"%24r" % x
+    if x != x:
+        return b"NaN".rjust(VALUE_WIDTH)
+    return (b"+Inf" if x > 0 else b"-Inf").rjust(VALUE_WIDTH)
+
+def _escape_help(s: str) -> str:
+    return s.replace("\\", r"\\").replace("\n", r"\n")
+
+def _escape_label(s: str) -> str:
+    return s.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+class Slot:
+    """One sample line of the page; quacks like a prometheus_client child (set/inc)"""
+    def __init__(self, page, prefix: bytes):
+        self.page = page
+        self.prefix = prefix
+        self.value = _format_value(0.0)
+        self.num = 0.0
+        self.off = 0
+
+    def set(self, value):
+        v = _format_value(value)
+        page = self.page
+        with page.lock:
+            self.num = value
+            self.value = v
+            page.buf[self.off:self.off + VALUE_WIDTH] = v
+
+    def inc(self, amount=1):
+        with self.page.lock:
+            self.set(self.num + amount)
+
+class Family:
+    """A metric family on the page; labels() binds one Slot per label set, like Gauge.labels()"""
+    def __init__(self, page, name: str, documentation: str, typ: str, labelnames=(), sample_name=None):
+        self.page = page
+        self.name = name
+        self.sample_name = sample_name or name
+        self.labelnames = tuple(labelnames)
+        self.header = ("# HELP %s %s\n# TYPE %s %s\n" % (name, _escape_help(documentation), name, typ)).encode()
+        self.slots = {}
+        if not self.labelnames:
+            self.slots[()] = Slot(page, self.sample_name.encode() + b" ")
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        slot = self.slots.get(key)
+        if slot is None:
+            with self.page.lock:
+                slot = self.slots.get(key)
+                if slot is None:
+                    labels = ",".join('%s="%s"' % (n, _escape_label(v)) for n, v in zip(self.labelnames, key))
+                    slot = self.slots[key] = Slot(self.page, ("%s{%s} " % (self.sample_name, labels)).encode())
+                    self.page.render()
+        return slot
+
+    def set(self, value):
+        self.slots[()].set(value)
+
+    def inc(self, amount=1):
+        self.slots[()].inc(amount)
+
+    def info(self, val: dict):
+        """Info-style family: a single sample whose labels carry the data"""
+        with self.page.lock:
+            self.labelnames = tuple(val)
+            self.slots.clear()
+        self.labels(**val).set(1.0)
+
+class MetricsPage:
+    """
+    The whole /metrics exposition kept as one pre-rendered bytearray. Values are patched
+    in place on set(); the page is only re-rendered when a new label set appears.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.families = []
+        self.buf = bytearray()
+
+    def _add(self, family: Family) -> Family:
+        with self.lock:
+            self.families.append(family)
+            self.render()
+        return family
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Family:
+        return self._add(Family(self, name, documentation, "gauge", labelnames))
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Family:
+        return self._add(Family(self, name, documentation, "counter", labelnames, sample_name=name + "_total"))
+
+    def info(self, name: str, documentation: str) -> Family:
+        family = self._add(Family(self, name + "_info", documentation, "gauge"))
+        family.set(1.0)
+        return family
+
+    def render(self):
+        with self.lock:
+            buf = bytearray()
+            for family in self.families:
+                buf += family.header
+                for slot in family.slots.values():
+                    buf += slot.prefix
+                    slot.off = len(buf)
+                    buf += slot.value
+                    buf += b"\n"
+            self.buf = buf
+
+    def snapshot(self) -> bytes:
+        with self.lock:
+            return bytes(self.buf)
+
+def serve_metrics_page(page: MetricsPage, addr: str, port: int) -> ThreadingHTTPServer:
+    """Serve the page on every GET path from a daemon thread, like start_http_server"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = page.snapshot()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
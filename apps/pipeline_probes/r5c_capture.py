@@ -1,8 +1,20 @@
 #!/usr/bin/env python3
 # GStreamer-based pipeline probes for R5C -> YUAN capture. Falls back to synthetic probe events.
-import os, time, json, pathlib, argparse, random
+import os, sys, time, json, pathlib, argparse, random, signal
 from datetime import datetime
 
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+if HAVE_ORJSON:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 try:
     import gi
     gi.require_version('Gst', '1.0')
@@ -12,6 +24,9 @@ try:
 except Exception:
     GST_AVAILABLE=False
 
+FLUSH_INTERVAL_S = 0.5  # upper bound on events held in the userspace write buffer
+WRITE_BUFFER_SIZE = 1 << 16
+
 def clock_ns():
     return time.clock_gettime_ns(time.CLOCK_MONOTONIC_RAW)
 
@@ -24,9 +39,10 @@ def write_event(fh, stage, extra=None):
     ts = clock_ns()
     payload = {"ts_ns": ts, "source":"pipeline", "kv": {"stage": stage}}
     if extra: payload["kv"].update(extra)
-    fh.write(json.dumps(payload) + "\n")
+    fh.write(_dumps(payload) + b"\n")
 
 def run_synthetic(out):
+    last_flush = time.monotonic()
     while True:
         write_event(out, "ingress")
         time.sleep(0.010)  # 10ms
@@ -34,6 +50,10 @@ def run_synthetic(out):
         # inference done event could be 15-40ms after ingress
         time.sleep(0.020 + random.random()*0.020)
         write_event(out, "inference_done")
+        now = time.monotonic()
+        if now - last_flush >= FLUSH_INTERVAL_S:
+            out.flush()
+            last_flush = now
         time.sleep(0.010)
 
 def main():
@@ -47,15 +67,21 @@ def main():
 
     data_root = pathlib.Path(args.data_root)
     root = session_root(data_root, args.session)
-    out = (root / "raw" / "pipeline.jsonl").open("a")
+    out = (root / "raw" / "pipeline.jsonl").open("ab", buffering=WRITE_BUFFER_SIZE)
 
-    if args.simulate or not GST_AVAILABLE:
-        run_synthetic(out)
-        return
+    # Unwind through the finally below so buffered events reach disk
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
-    # Real GStreamer pipeline would be configured here with pad probes
-    # For brevity, we only provide the skeleton; use --simulate for dev.
-    run_synthetic(out)
+    try:
+        if args.simulate or not GST_AVAILABLE:
+            run_synthetic(out)
+            return
+
+        # Real GStreamer pipeline would be configured here with pad probes
+        # For brevity, we only provide the skeleton; use --simulate for dev.
+        run_synthetic(out)
+    finally:
+        out.close()
 
 if __name__ == "__main__":
     main()
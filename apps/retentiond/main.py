@@ -1,7 +1,33 @@
 #!/usr/bin/env python3
-import os, sys, time, pathlib, argparse, shutil, json
+import os, re, sys, time, pathlib, argparse, json
 from datetime import datetime, timedelta
 
+# Session ids start with a "%Y-%m-%dT%H-%M-%SZ" timestamp; strptime is slow for a plain fixed layout
+_TS_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2})-(\d{2})-(\d{2})Z")
+
+def session_time(entry: os.DirEntry) -> datetime:
+    """Start time from the session id prefix, else the directory mtime"""
+    m = _TS_RE.match(entry.name)
+    if m:
+        try:
+            return datetime(*map(int, m.groups()))
+        except ValueError:
+            pass  # out-of-range field, e.g. month 13
+    return datetime.utcfromtimestamp(entry.stat().st_mtime)
+
+def _rmtree_fast(path):
+    """Delete a directory tree; d_type from scandir saves a stat per entry, symlinks are unlinked"""
+    if os.path.islink(path):
+        os.unlink(path)  # e.g. raw/ kept on another disk: drop the link, never the target
+        return
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _rmtree_fast(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--data-root", default=os.environ.get("BENCHLAB_DATA_ROOT","/var/log/benchlab"))
@@ -16,24 +42,21 @@ def main():
     if not root.exists():
         return
 
-    for sess in sorted(root.iterdir()):
-        if not sess.is_dir(): continue
-        # parse session id as timestamp prefix if possible
-        try:
-            t = datetime.strptime(sess.name[:20], "%Y-%m-%dT%H-%M-%SZ")
-        except Exception:
-            # fallback to mtime
-            t = datetime.utcfromtimestamp(sess.stat().st_mtime)
-        age_days = (now - t).days
+    with os.scandir(root) as entries:
+        sessions = [e for e in entries if e.is_dir()]
+
+    for entry in sessions:
+        age_days = (now - session_time(entry)).days
 
+        sess = pathlib.Path(entry.path)
         raw = sess/"raw"
         if raw.exists() and age_days > args.raw_keep_days:
             # remove raw to save space; keep aligned and parquet
-            try: shutil.rmtree(raw)
+            try: _rmtree_fast(raw)
             except Exception: pass
 
         if age_days > args.days:
-            try: shutil.rmtree(sess)
+            try: _rmtree_fast(sess)
             except Exception: pass
 
     if not args.run_once:
@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
-import os, sys, time, json, pathlib, argparse
+import os, sys, time, json, math, random, pathlib, argparse, signal
 from datetime import datetime
 import psutil
 
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+if HAVE_ORJSON:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 try:
     import pynvml
     NVML_AVAILABLE = True
 except Exception:
     NVML_AVAILABLE = False
 
+FLUSH_INTERVAL_S = 0.5  # upper bound on samples held in the userspace write buffer
+WRITE_BUFFER_SIZE = 1 << 16
+
 def clock_ns():
     return time.clock_gettime_ns(time.CLOCK_MONOTONIC_RAW)
 
@@ -17,6 +32,38 @@ def session_root(data_root: pathlib.Path, session: str):
     (r / "raw").mkdir(parents=True, exist_ok=True)
     return r
 
+class CpuSampler:
+    """System-wide CPU utilisation from /proc/stat deltas, same figure as psutil.cpu_percent"""
+    def __init__(self):
+        try:
+            # One persistent fd; procfs regenerates the contents on every read from offset 0
+            self.fd = os.open("/proc/stat", os.O_RDONLY)
+        except OSError:
+            self.fd = None
+            psutil.cpu_percent(interval=None)  # prime psutil's baseline
+            return
+        self.last_idle, self.last_total = self._read()
+
+    def _read(self):
+        data = os.pread(self.fd, 512, 0)
+        # "cpu  user nice system idle iowait irq softirq steal guest guest_nice"; guest time
+        # is already counted in user/nice
+        f = data[:data.index(b"\n")].split(None, 9)
+        idle = int(f[4]) + int(f[5])
+        total = sum(int(x) for x in f[1:9])
+        return idle, total
+
+    def percent(self) -> float:
+        if self.fd is None:
+            return psutil.cpu_percent(interval=None)
+        idle, total = self._read()
+        d_total = total - self.last_total
+        d_idle = idle - self.last_idle
+        self.last_idle, self.last_total = idle, total
+        if d_total <= 0:
+            return 0.0
+        return round(100.0 * (d_total - d_idle) / d_total, 1)
+
 def init_nvml(device_index: int):
     if not NVML_AVAILABLE:
         return None
@@ -57,39 +104,58 @@ def main():
     ap.add_argument("--device-index", type=int, default=int(os.environ.get("BENCHLAB_GPU_INDEX","0")))
     ap.add_argument("--daemon", action="store_true")
     ap.add_argument("--simulate", action="store_true", help="generate synthetic GPU power if NVML unavailable")
+    ap.add_argument("--legacy-split", action="store_true",
+                    help="write separate gpu.nvml and cpu.psutil records instead of one combined record per sample")
     args = ap.parse_args()
 
     data_root = pathlib.Path(args.data_root)
     root = session_root(data_root, args.session)
-    out = (root / "raw" / "telemetry.jsonl").open("a")
+    out = (root / "raw" / "telemetry.jsonl").open("ab", buffering=WRITE_BUFFER_SIZE)
 
     dev = init_nvml(args.device_index)
+    cpu_sampler = CpuSampler()
     period = 1.0/args.hz
     t_last = time.time()
 
-    while True:
-        ts = clock_ns()
-        gpu = sample_gpu(dev)
-        if not gpu and args.simulate:
-            # simple synthetic signal
-            import math, random
-            t = time.time()
-            gpu = {
-                "gpu_util": abs(math.sin(t/3))*90.0,
-                "mem_util": abs(math.sin(t/5))*60.0,
-                "gpu_mem_used": int(16e9),
-                "gpu_mem_total": int(48e9),
-                "power_w": 220 + 60*abs(math.sin(t/2)) + random.random()*5.0,
-                "temp_c": 55 + 10*abs(math.sin(t/4)),
-            }
-        cpu = {"cpu_util": psutil.cpu_percent(interval=None)}
-        out.write(json.dumps({"ts_ns": ts, "source":"gpu.nvml","kv":gpu}) + "\n")
-        out.write(json.dumps({"ts_ns": ts, "source":"cpu.psutil","kv":cpu}) + "\n")
-        out.flush()
-        # sleep
-        dt = period - (time.time() - t_last)
-        if dt > 0: time.sleep(dt)
-        t_last = time.time()
+    last_flush = time.monotonic()
+
+    # Unwind through the finally below so buffered samples reach disk
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        while True:
+            ts = clock_ns()
+            gpu = sample_gpu(dev)
+            if not gpu and args.simulate:
+                # simple synthetic signal
+                t = time.time()
+                gpu = {
+                    "gpu_util": abs(math.sin(t/3))*90.0,
+                    "mem_util": abs(math.sin(t/5))*60.0,
+                    "gpu_mem_used": int(16e9),
+                    "gpu_mem_total": int(48e9),
+                    "power_w": 220 + 60*abs(math.sin(t/2)) + random.random()*5.0,
+                    "temp_c": 55 + 10*abs(math.sin(t/4)),
+                }
+            cpu = {"cpu_util": cpu_sampler.percent()}
+            if args.legacy_split:
+                out.write(_dumps({"ts_ns": ts, "source":"gpu.nvml","kv":gpu}) + b"\n")
+                out.write(_dumps({"ts_ns": ts, "source":"cpu.psutil","kv":cpu}) + b"\n")
+            else:
+                # Both sources share the sample timestamp: one record, one serialization
+                out.write(_dumps({"ts_ns": ts, "sources": {"gpu.nvml": gpu, "cpu.psutil": cpu}}) + b"\n")
+
+            now = time.monotonic()
+            if now - last_flush >= FLUSH_INTERVAL_S:
+                out.flush()
+                last_flush = now
+
+            # sleep
+            dt = period - (time.time() - t_last)
+            if dt > 0: time.sleep(dt)
+            t_last = time.time()
+    finally:
+        out.close()
 
 if __name__ == "__main__":
     main()
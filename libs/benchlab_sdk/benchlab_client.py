@@ -5,15 +5,100 @@ This library provides a high-level interface for interacting with BenchLab devic
 through the HTTP service API.
 """
 
+import asyncio
+import json
+import random
+import socket
+import sys
 import time
-from typing import Optional, Iterator, Dict, Any, List
+from typing import Optional, Iterator, AsyncIterator, Iterable, Dict, Any, List, Tuple
 from dataclasses import dataclass
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util.retry import Retry
 
+try:
+    import simdjson
+    HAVE_SIMDJSON = True
+except Exception:
+    HAVE_SIMDJSON = False
+
+try:
+    import httpx
+    HAVE_HTTPX = True
+except Exception:
+    HAVE_HTTPX = False
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except Exception:
+    HAVE_NUMPY = False
+
+STREAM_CHUNK_SIZE = 1 << 16
+POOL_SIZE = 32  # a long-lived stream plus concurrent control calls per host
+BACKOFF_BASE_S = 1.0
+BACKOFF_CAP_S = 30.0
+
+
+def _split_ndjson(carry: bytes, chunk: bytes) -> Tuple[List[bytes], bytes]:
+    """Complete non-empty lines in carry + chunk, and the partial line left over."""
+    if carry:
+        chunk = carry + chunk
+    lines = chunk.split(b"\n")
+    carry = lines.pop()
+    return [line for line in lines if line.strip()], carry
+
+
+def _iter_ndjson_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split a stream of byte chunks into non-empty NDJSON lines, carrying partial lines over."""
+    carry = b""
+    for chunk in chunks:
+        lines, carry = _split_ndjson(carry, chunk)
+        yield from lines
+    if carry.strip():
+        yield carry
+
+
+def _iter_body(response: requests.Response) -> Iterator[bytes]:
+    """
+    Body bytes of a streamed response as they arrive. read(n) and iter_content() wait for
+    n bytes or EOF on a body that is not chunked; urllib3 2's read1() returns what is there.
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:  # urllib3 1.x
+        yield from response.iter_content(chunk_size=None)
+        return
+    while True:
+        data = read1(STREAM_CHUNK_SIZE, decode_content=True)
+        if not data:
+            return
+        yield data
+
+
+def _next_backoff(previous: float) -> float:
+    """Decorrelated jitter, so clients dropped together don't reconnect in lockstep."""
+    return min(BACKOFF_CAP_S, random.uniform(BACKOFF_BASE_S, previous * 3))
+
+
+def _columns(name: str, rows: List[Any]) -> Dict[str, Any]:
+    """Per-channel rows as float64 columns: one per numeric key for dict rows, else one array."""
+    if rows and isinstance(rows[0], dict):
+        return {f"{name}.{key}": np.array([row.get(key, np.nan) for row in rows], dtype=np.float64)
+                for key, value in rows[0].items() if isinstance(value, (int, float))}
+    return {name: np.array(rows, dtype=np.float64)}
+
+
+# from_json builders fill the frozen slots directly instead of binding __init__ kwargs
+_new = object.__new__
+_setattr = object.__setattr__
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain frozen dataclasses
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class DeviceInfo:
     """Information about a BenchLab device."""
     device: str
@@ -24,8 +109,21 @@ class DeviceInfo:
     is_valid: bool
     timestamp: str
 
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "DeviceInfo":
+        """Build from a /devices/{id}/info response body."""
+        self = _new(cls)
+        _setattr(self, 'device', data['device'])
+        _setattr(self, 'name', data['name'])
+        _setattr(self, 'vendor_id', data['vendorId'])
+        _setattr(self, 'product_id', data['productId'])
+        _setattr(self, 'firmware_version', data['firmwareVersion'])
+        _setattr(self, 'is_valid', data['isValid'])
+        _setattr(self, 'timestamp', data['timestamp'])
+        return self
+
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class SensorReading:
     """Sensor telemetry data from a BenchLab device."""
     device: str
@@ -36,6 +134,50 @@ class SensorReading:
     power: List[Dict[str, float]]
     fans: List[Dict[str, Any]]
 
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SensorReading":
+        """Build from a /devices/{id}/sensors response body."""
+        self = _new(cls)
+        _setattr(self, 'device', data['device'])
+        _setattr(self, 'timestamp', data['timestamp'])
+        _setattr(self, 'voltages', data['voltages'])
+        _setattr(self, 'temperatures', data['temperatures'])
+        _setattr(self, 'humidity', data['humidity'])
+        _setattr(self, 'power', data['power'])
+        _setattr(self, 'fans', data['fans'])
+        return self
+
+    def total_power_w(self) -> float:
+        """Sum of the per-rail watts."""
+        total = 0.0
+        for rail in self.power:
+            total += rail['w']
+        return total
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """
+        Voltage, power rail and fan channels as NumPy columns, keyed like 'power.w' or
+        'fans.rpm', so aggregators can stack many readings and reduce them in NumPy.
+        """
+        if not HAVE_NUMPY:
+            raise BenchLabError("SensorReading.to_arrays requires numpy (pip install numpy)")
+        arrays = _columns('voltages', self.voltages)
+        arrays.update(_columns('power', self.power))
+        arrays.update(_columns('fans', self.fans))
+        return arrays
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets keep urllib3's TCP_NODELAY and add TCP keep-alive."""
+
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
 
 class BenchLabError(Exception):
     """Base exception for BenchLab client errors."""
@@ -79,7 +221,7 @@ class BenchLabClient:
 
         # Stream telemetry data
         for reading in client.stream_telemetry("/dev/benchlab0"):
-            print(f"Power: {sum(p['w'] for p in reading.power):.2f}W")
+            print(f"Power: {reading.total_power_w():.2f}W")
         ```
     """
 
@@ -112,7 +254,11 @@ class BenchLabClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = _KeepAliveAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            max_retries=retry_strategy
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -122,6 +268,19 @@ class BenchLabClient:
 
         self.session.verify = verify_ssl
 
+    @staticmethod
+    def _check_status(response) -> None:
+        """Map HTTP errors to client exceptions (works for requests and httpx responses)."""
+        if response.status_code == 401:
+            raise AuthenticationError("Invalid or missing API key")
+        elif response.status_code == 404:
+            raise DeviceNotFoundError(f"Device not found: {response.json().get('error', 'Unknown')}")
+        elif response.status_code == 409:
+            raise DeviceBusyError("Device is already in use by another client")
+        elif response.status_code >= 400:
+            error_msg = response.json().get('error', response.text) if response.text else f"HTTP {response.status_code}"
+            raise BenchLabError(f"Request failed: {error_msg}")
+
     def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Make an HTTP request with error handling."""
         url = f"{self.base_url}{endpoint}"
@@ -134,17 +293,7 @@ class BenchLabClient:
                 **kwargs
             )
 
-            # Handle HTTP errors
-            if response.status_code == 401:
-                raise AuthenticationError("Invalid or missing API key")
-            elif response.status_code == 404:
-                raise DeviceNotFoundError(f"Device not found: {response.json().get('error', 'Unknown')}")
-            elif response.status_code == 409:
-                raise DeviceBusyError("Device is already in use by another client")
-            elif response.status_code >= 400:
-                error_msg = response.json().get('error', response.text) if response.text else f"HTTP {response.status_code}"
-                raise BenchLabError(f"Request failed: {error_msg}")
-
+            self._check_status(response)
             return response
 
         except requests.exceptions.Timeout:
@@ -199,17 +348,7 @@ class BenchLabClient:
         params = {'timeout': timeout} if timeout else {}
 
         response = self._request('GET', f'/devices/{device_id}/info', params=params)
-        data = response.json()
-
-        return DeviceInfo(
-            device=data['device'],
-            name=data['name'],
-            vendor_id=data['vendorId'],
-            product_id=data['productId'],
-            firmware_version=data['firmwareVersion'],
-            is_valid=data['isValid'],
-            timestamp=data['timestamp']
-        )
+        return DeviceInfo.from_json(response.json())
 
     def read_sensors(self, device: str, timeout: Optional[int] = None) -> SensorReading:
         """
@@ -226,23 +365,14 @@ class BenchLabClient:
         params = {'timeout': timeout} if timeout else {}
 
         response = self._request('GET', f'/devices/{device_id}/sensors', params=params)
-        data = response.json()
-
-        return SensorReading(
-            device=data['device'],
-            timestamp=data['timestamp'],
-            voltages=data['voltages'],
-            temperatures=data['temperatures'],
-            humidity=data['humidity'],
-            power=data['power'],
-            fans=data['fans']
-        )
+        return SensorReading.from_json(response.json())
 
     def stream_telemetry(
         self,
         device: Optional[str] = None,
         timeout: Optional[int] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        lazy: bool = False
     ) -> Iterator[Dict[str, Any]]:
         """
         Stream telemetry data from a device (continuous).
@@ -254,6 +384,8 @@ class BenchLabClient:
             device: Optional device path (auto-discovers if not specified)
             timeout: Optional timeout in milliseconds
             max_retries: Maximum number of reconnection attempts
+            lazy: Yield read-only simdjson objects that decode fields on access
+                instead of dicts (requires pysimdjson; ignored without it)
 
         Yields:
             Dictionary containing telemetry data
@@ -264,7 +396,8 @@ class BenchLabClient:
                 print(f"Temp: {reading['chipTemp']}°C")
             ```
         """
-        import json
+        # One parser per stream so its buffers are reused across documents
+        parser = simdjson.Parser() if HAVE_SIMDJSON else None
 
         params = {}
         if device:
@@ -273,34 +406,126 @@ class BenchLabClient:
             params['timeout'] = timeout
 
         retry_count = 0
+        backoff = BACKOFF_BASE_S
 
         while retry_count <= max_retries:
             try:
                 with self._request('GET', '/stream', params=params, stream=True, timeout=None) as response:
                     retry_count = 0  # Reset on successful connection
-
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                # Parse each NDJSON line as separate JSON object
-                                line_str = line.decode('utf-8') if isinstance(line, bytes) else line
-                                data = json.loads(line_str)
-                                yield data
-                            except json.JSONDecodeError as e:
-                                # Skip malformed JSON lines but log warning
-                                continue
-                            except Exception as e:
-                                # Skip other parsing errors
-                                continue
+                    backoff = BACKOFF_BASE_S
+
+                    # Split whatever the socket delivers ourselves rather than letting
+                    # iter_lines() walk it in small pieces
+                    for line in _iter_ndjson_lines(_iter_body(response)):
+                        try:
+                            # Parse each NDJSON line as separate JSON object
+                            if parser is None:
+                                data = json.loads(line)
+                            elif not lazy:
+                                data = parser.parse(line).as_dict()
+                            else:
+                                try:
+                                    data = parser.parse(line)
+                                except RuntimeError:
+                                    # The caller kept the previous reading, which pins
+                                    # this parser; give the rest of the stream a new one
+                                    parser = simdjson.Parser()
+                                    data = parser.parse(line)
+                        except ValueError:
+                            # Skip malformed JSON lines
+                            continue
+                        yield data
+                        data = None  # don't pin the parser ourselves between readings
 
             except (BenchLabError, requests.exceptions.RequestException) as e:
                 retry_count += 1
                 if retry_count > max_retries:
                     raise BenchLabError(f"Stream failed after {max_retries} retries: {e}")
 
-                # Exponential backoff
-                wait_time = min(2 ** retry_count, 30)
-                time.sleep(wait_time)
+                backoff = _next_backoff(backoff)
+                time.sleep(backoff)
+
+    async def astream_telemetry(
+        self,
+        device: Optional[str] = None,
+        timeout: Optional[int] = None,
+        max_retries: int = 3
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream telemetry data from a device without blocking the event loop.
+
+        Async counterpart of stream_telemetry(), built on httpx (optional
+        dependency). Reconnect waits use asyncio.sleep.
+
+        Args:
+            device: Optional device path (auto-discovers if not specified)
+            timeout: Optional timeout in milliseconds
+            max_retries: Maximum number of reconnection attempts
+
+        Yields:
+            Dictionary containing telemetry data
+
+        Example:
+            ```python
+            async for reading in client.astream_telemetry("/dev/benchlab0"):
+                print(f"Temp: {reading['chipTemp']}°C")
+            ```
+        """
+        if not HAVE_HTTPX:
+            raise BenchLabError("astream_telemetry requires httpx (pip install httpx)")
+
+        parser = simdjson.Parser() if HAVE_SIMDJSON else None
+
+        params = {}
+        if device:
+            params['device'] = device
+        if timeout:
+            params['timeout'] = timeout
+
+        headers = {}
+        if 'Authorization' in self.session.headers:
+            headers['Authorization'] = self.session.headers['Authorization']
+
+        retry_count = 0
+        backoff = BACKOFF_BASE_S
+
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            verify=self.session.verify,
+            timeout=httpx.Timeout(self.timeout, read=None)
+        ) as client:
+            while retry_count <= max_retries:
+                try:
+                    async with client.stream('GET', '/stream', params=params) as response:
+                        if response.status_code >= 400:
+                            await response.aread()
+                            self._check_status(response)
+                        retry_count = 0  # Reset on successful connection
+                        backoff = BACKOFF_BASE_S
+
+                        carry = b""
+                        # no chunk size: a sized aiter_bytes() holds data back until it has filled
+                        async for chunk in response.aiter_bytes():
+                            lines, carry = _split_ndjson(carry, chunk)
+                            for line in lines:
+                                try:
+                                    if parser is not None:
+                                        data = parser.parse(line).as_dict()
+                                    else:
+                                        data = json.loads(line)
+                                except ValueError:
+                                    # Skip malformed JSON lines
+                                    continue
+                                yield data
+
+                except (BenchLabError, httpx.HTTPError) as e:
+                    retry_count += 1
+                    if retry_count > max_retries:
+                        raise BenchLabError(f"Stream failed after {max_retries} retries: {e}")
+
+                    backoff = _next_backoff(backoff)
+                    await asyncio.sleep(backoff)
 
     def write_data(self, device: str, data: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,55 @@
+import asyncio, http.server, threading
+import pytest
+from libs.benchlab_sdk import BenchLabClient
+
+@pytest.fixture(params=["chunked", "close"])
+def live_server(request):
+    """Streams one record, then holds the connection open until the test is done with it"""
+    done = threading.Event()
+    closed = threading.Event()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" if request.param == "chunked" else "HTTP/1.0"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            body = b'{"device":"d","power":[{"w":1.5}]}\n'
+            if request.param == "chunked":
+                self.send_header("Transfer-Encoding", "chunked")
+                body = b"%x\r\n%s\r\n" % (len(body), body)
+            self.end_headers()
+            self.wfile.write(body)
+            self.wfile.flush()
+            done.wait(2)
+            if request.param == "chunked":
+                self.wfile.write(b"0\r\n\r\n")
+            self.close_connection = True
+            closed.set()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield BenchLabClient(f"http://127.0.0.1:{server.server_address[1]}"), closed
+    done.set()
+    server.shutdown()
+    server.server_close()
+
+def test_stream_yields_before_the_server_closes(live_server):
+    client, closed = live_server
+    reading = next(client.stream_telemetry(max_retries=0))
+    assert reading["device"] == "d"
+    assert not closed.is_set()
+
+def test_astream_yields_before_the_server_closes(live_server):
+    pytest.importorskip("httpx")
+    client, closed = live_server
+
+    async def first():
+        async for reading in client.astream_telemetry(max_retries=0):
+            return reading
+
+    assert asyncio.run(first())["device"] == "d"
+    assert not closed.is_set()
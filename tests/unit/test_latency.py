@@ -8,3 +8,31 @@ def test_pair_simple():
     out = p.pairs()
     assert len(out)==1
     assert abs(out[0]['lat_ms'] - 0.002) < 1e-9
+
+def test_pair_drops_stale_events():
+    p = Pairer('a','b')
+    p.add({"ts_aligned_ns": 0, "kv":{"stage":"a"}})
+    p.add({"ts_aligned_ns": 5_000_000_000, "kv":{"stage":"a"}})
+    p.add({"ts_aligned_ns": 5_000_001_000, "kv":{"stage":"b"}})
+    out = p.pairs()
+    assert [o['t_ns'] for o in out] == [5_000_000_000]
+    assert p.pairs() == []
+
+def test_pair_buffer_drops_oldest_when_full():
+    p = Pairer('a','b', maxlen=3)
+    for ts in (10, 20, 30, 40):
+        p.add({"ts_aligned_ns": ts, "kv":{"stage":"a"}})
+    p.add({"ts_aligned_ns": 45, "kv":{"stage":"b"}})
+    out = p.pairs()
+    assert [o['t_ns'] for o in out] == [20]
+    assert p.tailA - p.headA == 2
+
+def test_add_many_matches_add_stage():
+    one, many = Pairer('a','b', maxlen=4), Pairer('a','b', maxlen=4)
+    for ts in (10, 20, 30, 40, 50, 60):
+        one.add_stage('a', ts)
+    many.add_many('a', [10, 20, 30])
+    many.add_many('a', [40, 50, 60])
+    for p in (one, many):
+        p.add_stage('b', 35)
+    assert [o['t_ns'] for o in one.pairs()] == [o['t_ns'] for o in many.pairs()] == [30]
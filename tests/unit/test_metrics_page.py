@@ -0,0 +1,22 @@
+from prometheus_client.parser import text_string_to_metric_families
+from apps.muxd.metrics_page import MetricsPage
+
+def _samples(page):
+    return {(s.name, tuple(sorted(s.labels.items()))): s.value
+            for f in text_string_to_metric_families(page.snapshot().decode()) for s in f.samples}
+
+def test_page_patches_values_in_place():
+    page = MetricsPage()
+    g = page.gauge("rail_w", "Rail watts", ["rail"])
+    total = page.gauge("total_w", "Total")
+    r0 = g.labels(rail="0")
+    size = len(page.buf)
+    r0.set(12.5); total.set(float("inf"))
+    assert len(page.buf) == size
+    g.labels("1").set(-3e-7)
+    page.info("dev", "Device").info({"name": 'a"b'})
+    s = _samples(page)
+    assert s[("rail_w", (("rail", "0"),))] == 12.5
+    assert s[("rail_w", (("rail", "1"),))] == -3e-7
+    assert s[("total_w", ())] == float("inf")
+    assert s[("dev_info", (("name", 'a"b'),))] == 1.0
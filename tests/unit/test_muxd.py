@@ -0,0 +1,36 @@
+import os, sys, time, signal, pathlib, subprocess
+from apps.muxd.main import Tailer
+
+def test_tailer_drains_old_file_on_replacement(tmp_path):
+    p = tmp_path / "pipeline.jsonl"
+    p.write_bytes(b"")
+    t = Tailer(p)
+    with open(p, "ab") as f:
+        f.write(b"1\n2\n")
+    os.rename(p, tmp_path / "pipeline.jsonl.1")
+    p.write_bytes(b"3\n")
+    assert t.reopen_if_replaced() == [b"1", b"2"]
+    assert t.read_lines() == [b"3"]
+    assert t.reopen_if_replaced() == []
+
+def test_sigterm_drains_queued_records_to_disk(tmp_path):
+    root = tmp_path / "sessions" / "s"
+    proc = subprocess.Popen([sys.executable, "-m", "apps.muxd.main", "--data-root", str(tmp_path),
+                             "--session", "s", "--prom-bind", "127.0.0.1:0"],
+                            cwd=pathlib.Path(__file__).resolve().parents[2])
+    try:
+        aligned = root / "aligned" / "latency.jsonl"
+        deadline = time.monotonic() + 10
+        while not aligned.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)  # the export stage creates it after the tailers have opened
+        with open(root / "raw" / "benchlab.jsonl", "a") as f:
+            f.write('{"ts_ns":1,"kv":{"voltages":["x"]}}\n')  # must not stop the parse stage
+        with open(root / "raw" / "pipeline.jsonl", "a") as f:
+            for i in range(30):
+                f.write('{"ts_ns":%d,"kv":{"stage":"ingress"}}\n{"ts_ns":%d,"kv":{"stage":"encoded"}}\n'
+                        % (1000 + i * 100, 1050 + i * 100))
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=10) == 0
+    finally:
+        proc.kill()
+    assert len(aligned.read_text().splitlines()) == 30
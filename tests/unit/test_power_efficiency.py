@@ -0,0 +1,45 @@
+import json
+from apps.analytics.power_efficiency import parse_aligned_data, identify_optimal_points, generate_report
+
+def _write(path, rows):
+    with open(path, "w") as f:
+        for ts, lat, pwr in rows:
+            f.write(json.dumps({"ts_aligned_ns": ts, "source": "metric.latency",
+                                "kv": {"lat_ms": lat, "pair": ["a", "b"], "power_w": pwr}}) + "\n")
+
+def test_parse_aligned_soa(tmp_path):
+    p = tmp_path / "latency.jsonl"
+    _write(p, [(1_000_000_000, 10.0, 200.0), (2_000_000_000, 12.0, None), (3_000_000_000, 8.0, 100.0)])
+    data = parse_aligned_data(p)
+    assert len(data) == 2
+    assert data.ts.tolist() == [1.0, 3.0]
+    assert data.lat.tolist() == [10.0, 8.0]
+    assert data.pair[0] == ("a", "b")
+
+def test_optimal_points_best_first(tmp_path):
+    p = tmp_path / "latency.jsonl"
+    _write(p, [(i, lat, pwr) for i, (lat, pwr) in enumerate([(10, 100), (5, 100), (10, 0), (1, 100)] * 10)])
+    top = identify_optimal_points(parse_aligned_data(p), percentile=10)
+    assert top.tolist() == [3, 7, 11, 15]
+
+def test_tail_percentiles_are_nearest_rank(tmp_path):
+    p = tmp_path / "latency.jsonl"
+    _write(p, [(i, lat, 100.0) for i, lat in enumerate([10.0, 12.0, 21.5, 15.0, 29.4])])
+    generate_report(parse_aligned_data(p), tmp_path / "report.json")
+    stats = json.loads((tmp_path / "report.json").read_text())["latency_stats"]
+    assert stats["p95_ms"] == stats["p99_ms"] == 29.4
+
+    _write(p, [(i, float(i), 100.0) for i in range(1, 51)])
+    generate_report(parse_aligned_data(p), tmp_path / "report.json")
+    stats = json.loads((tmp_path / "report.json").read_text())["latency_stats"]
+    assert (stats["p95_ms"], stats["p99_ms"]) == (48.0, 50.0)
+
+def test_parse_aligned_keeps_samples_without_pair(tmp_path):
+    p = tmp_path / "latency.jsonl"
+    p.write_text('{"ts_aligned_ns":1000000000,"kv":{"lat_ms":5.0,"pair":null,"power_w":50.0}}\n'
+                 '{"ts_aligned_ns":2000000000,"kv":{"lat_ms":6.0,"pair":7,"power_w":60.0}}\n'
+                 '{"ts_aligned_ns":3000000000,"kv":{"lat_ms":7.0,"power_w":70.0}}\n')
+    data = parse_aligned_data(p)
+    assert data.lat.tolist() == [5.0, 7.0]
+    assert data.ts.tolist() == [1.0, 3.0]
+    assert data.pair.tolist() == [("unknown", "unknown")] * 2
@@ -0,0 +1,25 @@
+import os, sys
+from apps.retentiond.main import main
+
+def test_symlinked_dirs_are_unlinked_not_emptied(tmp_path, monkeypatch):
+    elsewhere = tmp_path / "elsewhere"
+    (elsewhere / "keep").mkdir(parents=True)
+    (elsewhere / "keep" / "important.txt").write_text("x")
+    (elsewhere / "top.txt").write_text("x")
+    sessions = tmp_path / "root" / "sessions"
+    old = sessions / "2020-01-01T00-00-00Z"
+    (old / "aligned").mkdir(parents=True)
+    os.symlink(elsewhere, old / "raw")
+    os.symlink(elsewhere, sessions / "2020-01-02T00-00-00Z")
+
+    monkeypatch.setattr(sys, "argv", ["retentiond", "--data-root", str(tmp_path / "root"),
+                                      "--days", "100000", "--run-once"])
+    main()
+    assert not os.path.lexists(old / "raw")
+    assert (old / "aligned").is_dir()
+    assert (elsewhere / "keep" / "important.txt").exists() and (elsewhere / "top.txt").exists()
+
+    monkeypatch.setattr(sys, "argv", ["retentiond", "--data-root", str(tmp_path / "root"), "--run-once"])
+    main()
+    assert os.listdir(sessions) == []
+    assert (elsewhere / "keep" / "important.txt").exists() and (elsewhere / "top.txt").exists()